@@ -13,21 +13,51 @@
 - Логирование операций
 """
 
-import argparse
+import atexit
+import base64
+import copy
+import itertools
 import logging
+import mmap
 import os
-import re
-import smtplib
+import queue
+import stat
+import string
 import sys
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Tuple
+from types import SimpleNamespace
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    List,
+    Tuple,
+    Union,
+)
+
+# smtplib, email.*, asyncio (вместе с ssl), tempfile и logging.handlers
+# импортируются внутри функций, которые их используют: запуск с --help
+# или с ошибкой в аргументах не тратит время на их загрузку.
+# argparse загружается только при необходимости (см. parse_args)
+if TYPE_CHECKING:
+    import argparse
+    import smtplib
+    import ssl
+    from email.mime.base import MIMEBase
+    from email.mime.multipart import MIMEMultipart
 
 # Константы
 ADMIN_MAIL = "noreply@example.com"  # Адрес отправителя по умолчанию
 DEFAULT_LOGFILE = "send2mail.log"  # Файл логов по умолчанию
+MAX_ATTACHMENT_BYTES = 10 * 1024 * 1024  # Максимальный размер письма с вложениями
 
 # Коды возврата
 EXIT_SUCCESS = 0  # Успешное выполнение
@@ -42,6 +72,81 @@ EXIT_INVALID_EMAIL = 8  # Невалидный email адрес
 EXIT_NO_FILES = 9  # Не указаны файлы для отправки
 EXIT_UNKNOWN_ERROR = 99  # Неизвестная ошибка
 
+# Описание кодов возврата для справки командной строки
+_RETURN_CODES_HELP = """
+Коды возврата:
+  {EXIT_SUCCESS} - Успешное выполнение
+  {EXIT_ARGUMENT_ERROR} - Ошибка в аргументах командной строки
+  {EXIT_FILE_NOT_FOUND} - Файл не найден
+  {EXIT_FILE_READ_ERROR} - Ошибка чтения файла
+  {EXIT_ATTACHMENT_ERROR} - Ошибка прикрепления файлов
+  {EXIT_SMTP_CONNECTION_ERROR} - Ошибка подключения к SMTP серверу
+  {EXIT_SMTP_AUTH_ERROR} - Ошибка аутентификации на SMTP сервере
+  {EXIT_SMTP_SEND_ERROR} - Ошибка отправки письма
+  {EXIT_INVALID_EMAIL} - Невалидный email адрес
+  {EXIT_NO_FILES} - Не указаны файлы для отправки
+  {EXIT_UNKNOWN_ERROR} - Неизвестная ошибка
+""".format(
+    EXIT_SUCCESS=EXIT_SUCCESS,
+    EXIT_ARGUMENT_ERROR=EXIT_ARGUMENT_ERROR,
+    EXIT_FILE_NOT_FOUND=EXIT_FILE_NOT_FOUND,
+    EXIT_FILE_READ_ERROR=EXIT_FILE_READ_ERROR,
+    EXIT_ATTACHMENT_ERROR=EXIT_ATTACHMENT_ERROR,
+    EXIT_SMTP_CONNECTION_ERROR=EXIT_SMTP_CONNECTION_ERROR,
+    EXIT_SMTP_AUTH_ERROR=EXIT_SMTP_AUTH_ERROR,
+    EXIT_SMTP_SEND_ERROR=EXIT_SMTP_SEND_ERROR,
+    EXIT_INVALID_EMAIL=EXIT_INVALID_EMAIL,
+    EXIT_NO_FILES=EXIT_NO_FILES,
+    EXIT_UNKNOWN_ERROR=EXIT_UNKNOWN_ERROR,
+)
+
+# Размер блока чтения файлов (64 КБ - оптимум для последовательного чтения)
+_IO_CHUNK = 65536
+# Размер блока при кодировании вложений в base64: ближайшее к _IO_CHUNK
+# значение, кратное 57 байтам, чтобы каждый блок давал целое число
+# строк по 76 символов без переноса остатка между блоками
+_B64_CHUNK = _IO_CHUNK // 57 * 57
+# Время простоя SMTP соединения (сек), после которого перед отправкой
+# выполняется проверка NOOP
+_SMTP_IDLE_CHECK = 30
+# Через каждые столько писем в одном соединении перед отправкой
+# выполняется проверка NOOP, даже если соединение не простаивало
+_SMTP_NOOP_EVERY = 50
+# Максимальный размер файла с данными аутентификации (читается за один вызов)
+_AUTH_FILE_MAX_SIZE = 4096
+# Число закодированных вложений, хранящихся в кэше
+_ATTACHMENT_CACHE_SIZE = 32
+# Максимальная длина строки письма в байтах без CRLF (RFC 5321)
+_SMTP_MAX_LINE = 998
+# Размер письма, до которого оно при отправке собирается в памяти,
+# а не во временном файле на диске
+_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# Файлы меньше этого размера читаются обычным read(), а не через mmap
+_MMAP_MIN_SIZE = 8192
+# Вложения больше этого размера кодируются при отправке и передаются
+# серверу блоками, не занимая память целиком
+_STREAM_MIN_SIZE = 1024 * 1024
+# Метка места большого вложения в сериализованном письме
+_STREAM_MARKER = b"\x00send2mail-attachment:"
+# Эффективный UID процесса (None на системах без os.geteuid)
+_EUID = os.geteuid() if hasattr(os, "geteuid") else None
+# Максимальное число потоков для параллельного чтения вложений
+_MAX_READ_WORKERS = 8
+# Запас на заголовки части MIME одного вложения (имя файла, тип, границы)
+_ATTACHMENT_OVERHEAD = 1024
+# Запас на заголовки и текст письма при разбиении вложений на письма
+_MESSAGE_OVERHEAD = 64 * 1024
+
+# Допустимые символы частей email адреса. Проверка validate_email
+# эквивалентна регулярному выражению
+# ^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9].+\Z,
+# но выполняется за один проход без возвратов
+_EMAIL_ALNUM = frozenset(string.ascii_letters + string.digits)
+# Таблицы str.translate, удаляющие допустимые символы: строка валидна,
+# если после translate от нее ничего не осталось
+_EMAIL_LOCAL_DELETE = str.maketrans("", "", "".join(_EMAIL_ALNUM) + "_.+-")
+_EMAIL_DOMAIN_DELETE = str.maketrans("", "", "".join(_EMAIL_ALNUM) + "-")
+
 
 # Пользовательские исключения
 class EmailSenderError(Exception):
@@ -68,27 +173,75 @@ class SMTPError(EmailSenderError):
     pass
 
 
-# Глобальная переменная для логгера
-logger = logging.getLogger()
+class DeliveryUnknownError(SMTPError):
+    """Соединение разорвано после передачи письма: сервер мог его принять."""
+
+    pass
+
+
+class FileEntry(NamedTuple):
+    """
+    Файл вложения с данными stat, полученными при проверке пути.
+
+    Attributes:
+        path (Path): Путь к файлу
+        name (str): Имя файла
+        size (int): Размер файла в байтах
+        mtime_ns (int): Время изменения файла в наносекундах
+    """
+
+    path: Path
+    name: str
+    size: int
+    mtime_ns: int
+
+
+# Вложение, заданное путем или уже проверенным FileEntry
+AttachmentSource = Union[Path, FileEntry]
+
 
+# Логгер модуля (имя задано явно: при запуске скрипта __name__ == "__main__")
+logger = logging.getLogger("send2mail")
 
+
+@lru_cache(maxsize=1024)
 def validate_email(email: str) -> bool:
     """
-    Проверяет валидность email адреса с помощью регулярного выражения.
+    Проверяет валидность email адреса.
+
     Args:
         email (str): Email адрес для проверки
 
     Returns:
         bool: True если email валиден, False в противном случае
 
+    Note:
+        Адрес разбирается по первому "@" и первой точке после него,
+        символы частей проверяются через str.translate - время проверки
+        линейно от длины адреса при любых входных данных
+        Результаты кэшируются: повторная проверка того же адреса
+        не выполняется
+
     Examples:
         >>> validate_email("test@example.com")
         True
         >>> validate_email("invalid.email")
         False
     """
-    pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9].+$"
-    return re.match(pattern, email) is not None
+    local, at, domain = email.partition("@")
+    if not local or not at:
+        return False
+    # Первая часть домена не может содержать точку, поэтому граница
+    # проходит по первой точке; после нее - буква или цифра и хотя бы
+    # один любой символ, кроме перевода строки
+    label, dot, tail = domain.partition(".")
+    if not label or not dot or len(tail) < 2 or "\n" in tail:
+        return False
+    if tail[0] not in _EMAIL_ALNUM:
+        return False
+    return not (
+        local.translate(_EMAIL_LOCAL_DELETE) or label.translate(_EMAIL_DOMAIN_DELETE)
+    )
 
 
 def validate_file_path(file_path: Path) -> bool:
@@ -104,16 +257,69 @@ def validate_file_path(file_path: Path) -> bool:
     Note:
         Записывает сообщения об ошибках в лог при обнаружении проблем
     """
-    if not file_path.exists():
-        logging.error(f"Файл не существует: {file_path}")
-        return False
-    if not file_path.is_file():
-        logging.error(f"Указанный путь не является файлом: {file_path}")
-        return False
-    if not os.access(file_path, os.R_OK):
-        logging.error(f"Нет прав на чтение файла: {file_path}")
-        return False
-    return True
+    return get_file_entry(file_path) is not None
+
+
+def get_file_entry(file_path: Path) -> Optional[FileEntry]:
+    """
+    Проверяет файл так же, как validate_file_path, и сохраняет данные stat.
+
+    Args:
+        file_path (Path): Путь к файлу для проверки
+
+    Returns:
+        FileEntry: Данные файла или None, если файл недоступен для чтения
+
+    Note:
+        Размер и время изменения из FileEntry используются при разбиении
+        вложений на письма и при их кодировании без повторных вызовов stat()
+    """
+    # Один вызов stat() вместо отдельных exists() и is_file()
+    path_str = os.fspath(file_path)
+    try:
+        st = os.stat(path_str)
+    except (FileNotFoundError, NotADirectoryError):
+        logger.error("Файл не существует: %s", file_path)
+        return None
+    except OSError as e:
+        logger.error("Ошибка доступа к файлу %s: %s", file_path, e)
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        logger.error("Указанный путь не является файлом: %s", file_path)
+        return None
+    # Владельцу файла чтение разрешает бит S_IRUSR - в этом частом случае
+    # отдельный вызов access() не нужен
+    owner_readable = st.st_uid == _EUID and st.st_mode & stat.S_IRUSR
+    if not owner_readable and not os.access(path_str, os.R_OK):
+        logger.error("Нет прав на чтение файла: %s", file_path)
+        return None
+    return FileEntry(file_path, file_path.name, st.st_size, st.st_mtime_ns)
+
+
+def _get_file_entry_cached(
+    path_str: str, cache: Dict[str, FileEntry]
+) -> Optional[FileEntry]:
+    """
+    Вызывает get_file_entry один раз для каждого пути в пределах разбора списка.
+
+    Args:
+        path_str (str): Путь к файлу в том виде, в каком он указан
+        cache (Dict[str, FileEntry]): Уже проверенные пути
+
+    Returns:
+        FileEntry: Данные файла или None, если файл недоступен для чтения
+
+    Note:
+        Повторы одного файла в списке (частые в сгенерированных списках)
+        не приводят к повторным системным вызовам. Кэш живет только
+        на время одного разбора, поэтому не устаревает при изменении файлов
+    """
+    entry = cache.get(path_str)
+    if entry is None:
+        entry = get_file_entry(Path(path_str))
+        if entry is not None:
+            cache[path_str] = entry
+    return entry
 
 
 def read_text_file(file_path: Path) -> str:
@@ -128,17 +334,48 @@ def read_text_file(file_path: Path) -> str:
 
     Raises:
         FileReadError: Если произошла ошибка при чтении файла
+
+    Note:
+        Файл читается целиком одним вызовом в двоичном режиме и
+        декодируется за один проход; переводы строк приводятся к "\\n",
+        как при чтении в текстовом режиме
     """
     try:
-        with file_path.open("r", encoding="utf-8") as f:
-            content = f.read()
-            logger.info(f"Успешно прочитан файл с текстом письма: {file_path}")
-            return content
+        with file_path.open("rb", buffering=0) as f:
+            data = f.read()
+        content = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        logger.info("Успешно прочитан файл с текстом письма: %s", file_path)
+        return content
     except Exception as e:
-        logger.error(f"Ошибка при чтении файла с текстом письма: {str(e)}")
+        logger.error("Ошибка при чтении файла с текстом письма: %s", e)
         raise FileReadError(f"Ошибка чтения файла {file_path}: {str(e)}")
 
 
+def read_lines(file_path: Path) -> List[str]:
+    """
+    Читает строки файла-списка в кодировке UTF-8.
+
+    Args:
+        file_path (Path): Путь к файлу
+
+    Returns:
+        List[str]: Строки файла без символов перевода строки
+
+    Raises:
+        OSError: Если файл не удалось прочитать
+        UnicodeDecodeError: Если файл не в кодировке UTF-8
+
+    Note:
+        Файл читается в двоичном режиме одним read(), без текстового
+        буфера
+    """
+    with file_path.open("rb", buffering=0) as f:
+        data = f.read()
+    # bytes.splitlines делит строки так же, как текстовый режим:
+    # по "\r", "\n" и "\r\n"
+    return [line.decode("utf-8") for line in data.splitlines()]
+
+
 def add_signature(body: str, sender: Optional[str] = None) -> str:
     """
     Добавляет стандартную подпись к тексту письма.
@@ -153,19 +390,77 @@ def add_signature(body: str, sender: Optional[str] = None) -> str:
     Note:
         Если sender не указан, используется ADMIN_MAIL
     """
-    signature = "\n\nЭто письмо отправлено автоматически. Отвечать на него не нужно."
+    contact = sender or ADMIN_MAIL
+    return (
+        f"{body}\n\nЭто письмо отправлено автоматически. "
+        f"Отвечать на него не нужно.\nОбратный адрес для связи: {contact}"
+    )
 
-    if sender:
-        signature += f"\nОбратный адрес для связи: {sender}"
-    else:
-        signature += f"\nОбратный адрес для связи: {ADMIN_MAIL}"
 
-    return body + signature
+def _fits_8bit(body: str) -> bool:
+    """
+    Проверяет, можно ли передать текст письма без кодирования (8bit).
+
+    Args:
+        body (str): Текст письма
+
+    Returns:
+        bool: True если все строки в UTF-8 укладываются в ограничение
+        длины строки SMTP
+    """
+    lines = body.encode("utf-8").splitlines()
+    return max(map(len, lines), default=0) <= _SMTP_MAX_LINE
+
+
+@lru_cache(maxsize=None)
+def _text_part_class() -> type:
+    """
+    Возвращает класс TextPart (создается при первом обращении).
+
+    Returns:
+        type: Подкласс MIMEText для текста письма
+
+    Note:
+        Класс создается внутри функции, чтобы не импортировать email.mime
+        при загрузке модуля
+    """
+    from email.mime.text import MIMEText
+
+    class TextPart(MIMEText):
+        """
+        Текст письма в UTF-8 и base64 с возможностью передачи в 8bit.
+
+        Сериализуется как обычный MIMEText (base64), поэтому сообщение
+        можно отправить любым способом. stream_send при поддержке
+        сервером 8BITMIME заменяет часть на as_8bit().
+        """
+
+        def __init__(self, body: str) -> None:
+            super().__init__(body, "plain", "utf-8")
+            self.text = body
+
+        def as_8bit(self) -> "MIMEText":
+            """
+            Создает ту же часть без кодирования тела (8bit).
+
+            Returns:
+                MIMEText: Часть с Content-Transfer-Encoding: 8bit или
+                сама часть, если строки текста длиннее _SMTP_MAX_LINE
+            """
+            from email.charset import Charset
+
+            if not _fits_8bit(self.text):
+                return self
+            charset = Charset("utf-8")
+            charset.body_encoding = None
+            return MIMEText(self.text, "plain", charset)
+
+    return TextPart
 
 
 def create_message(
     sender: str, recipient: str, subject: str, body: str
-) -> MIMEMultipart:
+) -> "MIMEMultipart":
     """
     Создает MIME сообщение с указанными параметрами.
 
@@ -182,49 +477,1063 @@ def create_message(
         EmailSenderError: Если произошла ошибка при создании сообщения
 
     Note:
-        Текст письма кодируется в UTF-8
+        Текст письма кодируется в UTF-8 и base64, поэтому сообщение
+        можно отправить любым способом (send_message, as_bytes).
+        stream_send передает текст без base64, если сервер поддерживает
+        8BITMIME (см. _text_part_class)
     """
+    from email.mime.multipart import MIMEMultipart
+
     try:
         message = MIMEMultipart()
         message["From"] = sender
         message["To"] = recipient
         message["Subject"] = subject
-        message.attach(MIMEText(body, "plain", "utf-8"))
+        message.attach(_text_part_class()(body))
         logger.debug("MIME сообщение успешно создано")
         return message
     except Exception as e:
-        logger.error(f"Ошибка при создании сообщения: {str(e)}", exc_info=True)
+        logger.error("Ошибка при создании сообщения: %s", e, exc_info=True)
         raise EmailSenderError(f"Ошибка создания сообщения: {str(e)}")
 
 
-def attach_files(message: MIMEMultipart, file_paths: List[Path]) -> bool:
+def _advise_sequential(fd: int) -> None:
+    """
+    Сообщает ядру, что файл будет прочитан последовательно и один раз.
+
+    Args:
+        fd (int): Дескриптор открытого файла
+
+    Note:
+        Увеличивает окно упреждающего чтения и не засоряет страничный кэш.
+        На платформах без posix_fadvise (Windows, macOS) ничего не делает
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_NOREUSE)
+    except OSError as e:
+        logger.debug("posix_fadvise не поддерживается: %s", e)
+
+
+def clone_for_recipient(template: "MIMEMultipart", recipient: str) -> "MIMEMultipart":
+    """
+    Создает копию готового сообщения для другого получателя.
+
+    Args:
+        template (MIMEMultipart): Сообщение с текстом и вложениями
+        recipient (str): Email получателя копии
+
+    Returns:
+        MIMEMultipart: Копия сообщения с замененным заголовком To
+
+    Note:
+        Части сообщения (текст и закодированные вложения) не копируются,
+        а используются совместно с исходным сообщением, поэтому файлы
+        читаются и кодируются один раз на всех получателей
+    """
+    message = copy.copy(template)
+    message.set_payload(list(template.get_payload()))
+    # del создает у копии собственный список заголовков,
+    # заголовки исходного сообщения не изменяются
+    del message["To"]
+    message["To"] = recipient
+    return message
+
+
+def _base64_size(size: int) -> int:
+    """
+    Вычисляет длину результата base64.encodebytes для данных заданного размера.
+
+    Args:
+        size (int): Размер исходных данных в байтах
+
+    Returns:
+        int: Длина закодированных данных с учетом переводов строк
+    """
+    full_lines, rest = divmod(size, 57)
+    length = full_lines * 77  # 76 символов + перевод строки
+    if rest:
+        length += (rest + 2) // 3 * 4 + 1
+    return length
+
+
+def _attachment_wire_size(size: int) -> int:
+    """
+    Оценивает объем вложения в письме при передаче серверу.
+
+    Args:
+        size (int): Размер файла в байтах
+
+    Returns:
+        int: Размер в base64 с переводами строк CRLF и заголовками части MIME
+    """
+    return _base64_size(size) + (size + 56) // 57 + _ATTACHMENT_OVERHEAD
+
+
+def encode_file_base64(file_path: Path) -> str:
+    """
+    Кодирует содержимое файла в base64, читая его по частям.
+
+    Args:
+        file_path (Path): Путь к файлу
+
+    Returns:
+        str: Содержимое файла в base64 со строками по 76 символов
+
+    Note:
+        Файл отображается в память через mmap, блоки передаются в base64
+        через memoryview, поэтому исходные данные не копируются ни целиком,
+        ни по блокам. Буфер под результат выделяется сразу нужного
+        размера (известного по stat), без перевыделений по мере роста
+        Файлы меньше _MMAP_MIN_SIZE читаются обычным read(): для них
+        накладные расходы на mmap больше выигрыша
+    """
+    # Данные читаются через mmap или одним read(), буфер файлового
+    # объекта не нужен
+    with file_path.open("rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _MMAP_MIN_SIZE:
+            return base64.encodebytes(f.read()).decode("ascii")
+
+        buf = bytearray(_base64_size(size))
+        mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        try:
+            # Данные читаются только через отображение, поэтому
+            # упреждающее чтение задается для него, а не для дескриптора
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                pos = 0
+                for offset in range(0, size, _B64_CHUNK):
+                    chunk = base64.encodebytes(view[offset : offset + _B64_CHUNK])
+                    buf[pos : pos + len(chunk)] = chunk
+                    pos += len(chunk)
+        finally:
+            mm.close()
+    return buf.decode("ascii")
+
+
+@lru_cache(maxsize=_ATTACHMENT_CACHE_SIZE)
+def _encode_file_cached(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Кэширующая обертка над encode_file_base64.
+
+    Args:
+        path (str): Путь к файлу
+        mtime_ns (int): Время изменения файла (часть ключа кэша)
+        size (int): Размер файла (часть ключа кэша)
+
+    Returns:
+        str: Содержимое файла в base64
+
+    Note:
+        mtime_ns и size в теле не используются: они входят в ключ,
+        чтобы измененный файл был закодирован заново
+    """
+    return encode_file_base64(Path(path))
+
+
+def _add_attachment_headers(part: "MIMEBase", filename: str) -> None:
+    """
+    Добавляет к части вложения заголовки кодирования и имени файла.
+
+    Args:
+        part (MIMEBase): Часть с уже закодированным в base64 содержимым
+            (или FileAttachment)
+        filename (str): Имя файла вложения
+
+    Note:
+        Содержимое кодируется заранее (encode_file_base64), поэтому
+        email.encoders и MIMEApplication не используются: заголовок
+        Content-Transfer-Encoding просто указывается
+    """
+    part["Content-Transfer-Encoding"] = "base64"
+    # add_header сам выбирает кодирование имени: как есть для ASCII,
+    # по RFC 2231 для остальных (например, кириллических) имен
+    part.add_header("Content-Disposition", "attachment", filename=filename)
+
+
+@lru_cache(maxsize=None)
+def _file_attachment_class() -> type:
+    """
+    Возвращает класс FileAttachment (создается при первом обращении).
+
+    Returns:
+        type: Подкласс MIMEBase для вложений, кодируемых при отправке
+
+    Note:
+        Класс создается внутри функции, чтобы не импортировать email.mime
+        при загрузке модуля
+    """
+    from email.mime.base import MIMEBase
+
+    class FileAttachment(MIMEBase):
+        """
+        Вложение, содержимое которого читается из файла только при отправке.
+
+        stream_send передает такое вложение в сокет блоками, не держа его
+        в памяти. Для остальных способов сериализации (as_bytes,
+        send_message) файл кодируется целиком при обращении к содержимому.
+        """
+
+        def __init__(self, file_path: Path) -> None:
+            super().__init__("application", "octet-stream", Name=file_path.name)
+            _add_attachment_headers(self, file_path.name)
+            self.source_path = file_path
+
+        @property
+        def _payload(self):
+            # Генераторы email читают _payload напрямую, поэтому файл
+            # кодируется целиком при первой сериализации вне stream_send
+            if self._encoded is None:
+                self._encoded = encode_file_base64(self.source_path)
+            return self._encoded
+
+        @_payload.setter
+        def _payload(self, value):
+            self._encoded = value
+
+        def is_multipart(self) -> bool:
+            return False
+
+        def iter_base64(self) -> Iterator[bytes]:
+            """
+            Кодирует файл в base64 блоками.
+
+            Yields:
+                bytes: Строки base64 по 76 символов с переводами строк CRLF
+            """
+            with self.source_path.open("rb", buffering=_IO_CHUNK) as f:
+                _advise_sequential(f.fileno())
+                while True:
+                    block = f.read(_B64_CHUNK)
+                    if not block:
+                        break
+                    yield base64.encodebytes(block).replace(b"\n", b"\r\n")
+
+    return FileAttachment
+
+
+def as_file_entry(source: AttachmentSource) -> FileEntry:
+    """
+    Приводит вложение к FileEntry, вызывая stat() только для путей.
+
+    Args:
+        source (Path | FileEntry): Путь к файлу или готовый FileEntry
+
+    Returns:
+        FileEntry: Данные файла
+
+    Raises:
+        OSError: Если не удалось получить данные файла
+    """
+    if isinstance(source, FileEntry):
+        return source
+    st = source.stat()
+    return FileEntry(source, source.name, st.st_size, st.st_mtime_ns)
+
+
+def load_attachment(file_path: AttachmentSource) -> "MIMEBase":
+    """
+    Читает файл и формирует из него MIME часть вложения.
+
+    Args:
+        file_path (Path | FileEntry): Путь к файлу или FileEntry
+            (размер и время изменения берутся из него без stat())
+
+    Returns:
+        MIMEBase: Готовая к добавлению в сообщение часть с вложением
+
+    Note:
+        Закодированное содержимое берется из кэша, если файл с теми же
+        путем, временем изменения и размером уже кодировался
+        Файлы больше _STREAM_MIN_SIZE не читаются сразу: они кодируются
+        при отправке и передаются серверу блоками (см. stream_send)
+    """
+    from email.mime.base import MIMEBase
+
+    entry = as_file_entry(file_path)
+    if entry.size > _STREAM_MIN_SIZE:
+        return _file_attachment_class()(entry.path)
+
+    payload = _encode_file_cached(os.fspath(entry.path), entry.mtime_ns, entry.size)
+    part = MIMEBase("application", "octet-stream", Name=entry.name)
+    part.set_payload(payload)
+    _add_attachment_headers(part, entry.name)
+    return part
+
+
+def _try_load_attachment(
+    file_path: AttachmentSource,
+) -> Tuple[Optional["MIMEBase"], Optional[Exception]]:
+    """
+    Вызывает load_attachment, возвращая ошибку вместо исключения.
+
+    Args:
+        file_path (Path | FileEntry): Файл для вложения
+
+    Returns:
+        Tuple[MIMEBase, Exception]: (часть, None) или (None, ошибка)
+    """
+    try:
+        return load_attachment(file_path), None
+    except Exception as e:
+        return None, e
+
+
+def attach_files(
+    message: "MIMEMultipart",
+    file_paths: List[AttachmentSource],
+    fail_fast: bool = False,
+) -> bool:
     """
     Добавляет вложения к MIME сообщению.
 
     Args:
         message (MIMEMultipart): MIME сообщение
-        file_paths (List[Path]): Список путей к файлам для вложения
+        file_paths (List[Path | FileEntry]): Файлы для вложения
+        fail_fast (bool): Прекратить обработку на первой ошибке
 
     Returns:
         bool: True если все файлы успешно добавлены, False если были ошибки
 
-    Note:
-        Продолжает обработку даже при ошибках с отдельными файлами
-        Логирует успешные и неудачные попытки добавления вложений
-    """
-    success = True
-    for file_path in file_paths:
-        try:
-            with file_path.open("rb") as f:
-                filename = file_path.name
-                part = MIMEApplication(f.read(), Name=filename)
-                part["Content-Disposition"] = f'attachment; filename="{filename}"'
-                message.attach(part)
-                logger.info(f"Успешно добавлено вложение: {filename}")
-        except Exception as e:
-            logger.error(f"Ошибка при добавлении вложения {file_path}: {str(e)}")
-            success = False
-    return success
+    Note:
+        Файлы читаются и кодируются параллельно в пуле потоков,
+        в сообщение добавляются в исходном порядке из основного потока
+        Без fail_fast продолжает обработку даже при ошибках с отдельными
+        файлами; с fail_fast еще не начатое чтение остальных файлов отменяется
+        Логирует успешные и неудачные попытки добавления вложений
+    """
+    if not file_paths:
+        return True
+
+    if len(file_paths) == 1:
+        # Один файл читается в текущем потоке, без создания пула
+        loaded = [_try_load_attachment(file_paths[0])]
+    else:
+        workers = min(_MAX_READ_WORKERS, len(file_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_try_load_attachment, path) for path in file_paths
+            ]
+            loaded = []
+            for future in futures:
+                loaded.append(future.result())
+                if fail_fast and loaded[-1][1] is not None:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+    success = True
+    for file_path, (part, error) in zip(file_paths, loaded):
+        if error is not None:
+            if isinstance(file_path, FileEntry):
+                file_path = file_path.path
+            logger.error("Ошибка при добавлении вложения %s: %s", file_path, error)
+            if fail_fast:
+                return False
+            success = False
+            continue
+        message.attach(part)
+        logger.info("Успешно добавлено вложение: %s", file_path.name)
+    return success
+
+
+class _DotStuffingWriter:
+    """
+    Файловый объект для BytesGenerator, экранирующий точки в начале строк.
+
+    Args:
+        fp: Файл, в который записываются данные
+
+    Note:
+        Экранирование выполняется при записи заменой b"\\n." целыми
+        блоками, поэтому готовый файл передается серверу без построчной
+        обработки. Положения строк-меток больших вложений (_STREAM_MARKER)
+        запоминаются в markers как (начало, конец, id части)
+    """
+
+    def __init__(self, fp) -> None:
+        self.fp = fp
+        self.at_line_start = True
+        self.markers = []
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        start = self.fp.tell()
+        stuffed = data.replace(b"\n.", b"\n..")
+        if self.at_line_start and stuffed.startswith(b"."):
+            stuffed = b"." + stuffed
+        self.fp.write(stuffed)
+        self.at_line_start = stuffed.endswith(b"\n")
+
+        pos = stuffed.find(_STREAM_MARKER)
+        while pos != -1:
+            end = stuffed.index(b"\r\n", pos) + 2
+            part_id = int(stuffed[pos + len(_STREAM_MARKER) : end - 2])
+            self.markers.append((start + pos, start + end, part_id))
+            pos = stuffed.find(_STREAM_MARKER, end)
+
+    def tell(self) -> int:
+        return self.fp.tell()
+
+
+def _send_spool_range(
+    smtp: "smtplib.SMTP", spool, offset: int, count: int, use_sendfile: bool
+) -> None:
+    """
+    Передает серверу участок временного файла с письмом.
+
+    Args:
+        smtp (smtplib.SMTP): Открытое соединение с сервером
+        spool: Временный файл с сериализованным письмом
+        offset (int): Начало участка
+        count (int): Длина участка в байтах
+        use_sendfile (bool): Передавать через socket.sendfile (только для
+            файла на диске и соединения без SSL)
+    """
+    if count <= 0:
+        return
+    if use_sendfile:
+        smtp.sock.sendfile(spool, offset, count)
+        return
+
+    spool.seek(offset)
+    while count > 0:
+        block = spool.read(min(_IO_CHUNK, count))
+        if not block:
+            break
+        smtp.sock.sendall(block)
+        count -= len(block)
+
+
+def _pipeline_envelope(
+    smtp: "smtplib.SMTP",
+    sender: str,
+    recipients: List[str],
+    mail_options: List[str],
+) -> Tuple[Tuple[int, bytes], List[Tuple[int, bytes]], Tuple[int, bytes]]:
+    """
+    Отправляет команды MAIL, RCPT и DATA одним пакетом (RFC 2920).
+
+    Args:
+        smtp (smtplib.SMTP): Соединение с сервером, поддерживающим PIPELINING
+        sender (str): Адрес отправителя
+        recipients (List[str]): Адреса получателей
+        mail_options (List[str]): Параметры команды MAIL (например, BODY=8BITMIME)
+
+    Returns:
+        Tuple: Ответы сервера (код, текст) на MAIL, на каждую команду RCPT
+        и на DATA, в порядке отправки команд
+
+    Note:
+        Вместо 2 + N обменов с сервером выполняется один
+    """
+    import smtplib
+
+    commands = [" ".join([f"MAIL FROM:{smtplib.quoteaddr(sender)}"] + mail_options)]
+    commands.extend(f"RCPT TO:{smtplib.quoteaddr(r)}" for r in recipients)
+    commands.append("DATA")
+    smtp.send("".join(f"{command}\r\n" for command in commands))
+
+    mail_reply = smtp.getreply()
+    rcpt_replies = [smtp.getreply() for _ in recipients]
+    data_reply = smtp.getreply()
+    return mail_reply, rcpt_replies, data_reply
+
+
+def stream_send(smtp: "smtplib.SMTP", message: "MIMEMultipart") -> None:
+    """
+    Передает письмо серверу по частям, не собирая его целиком в памяти.
+
+    Args:
+        smtp (smtplib.SMTP): Открытое соединение с сервером
+        message (MIMEMultipart): Сформированное MIME сообщение
+
+    Raises:
+        smtplib.SMTPSenderRefused: Если сервер отклонил отправителя
+        smtplib.SMTPRecipientsRefused: Если сервер отклонил всех получателей
+        smtplib.SMTPDataError: Если сервер не принял письмо
+        DeliveryUnknownError: Если соединение разорвано после передачи
+            письма, до ответа сервера
+
+    Note:
+        Аналог smtplib.SMTP.send_message: письмо сериализуется через
+        BytesGenerator с экранированием точек в начале строк во временный
+        файл (в памяти до _SPOOL_MAX_SIZE байт, дальше на диске). Файл
+        на диске без SSL передается через socket.sendfile. Большие вложения
+        (FileAttachment) кодируются и передаются прямо из файла
+        Если сервер поддерживает PIPELINING, команды конверта
+        отправляются одним пакетом (см. _pipeline_envelope)
+        Если сервер поддерживает 8BITMIME, текст письма из create_message
+        передается без base64 (BODY=8BITMIME, см. _text_part_class)
+    """
+    import smtplib
+    import tempfile
+    from email.generator import BytesGenerator
+    from email.utils import getaddresses
+
+    sender = getaddresses([message["From"]])[0][1]
+    recipients = [
+        addr
+        for _, addr in getaddresses(
+            message.get_all("To", []) + message.get_all("Cc", [])
+        )
+    ]
+
+    smtp.ehlo_or_helo_if_needed()
+    eight_bit = smtp.has_extn("8bitmime")
+    mail_options = ["BODY=8BITMIME"] if eight_bit else []
+
+    if smtp.has_extn("pipelining"):
+        mail_reply, rcpt_replies, data_reply = _pipeline_envelope(
+            smtp, sender, recipients, mail_options
+        )
+    else:
+        mail_reply = smtp.mail(sender, mail_options)
+        rcpt_replies = []
+        data_reply = None
+        if mail_reply[0] == 250:
+            rcpt_replies = [smtp.rcpt(recipient) for recipient in recipients]
+            if any(code in (250, 251) for code, _ in rcpt_replies):
+                data_reply = smtp.docmd("data")
+
+    def abort() -> None:
+        # При конвейерной отправке сервер мог уже принять DATA:
+        # передача завершается пустым письмом перед сбросом транзакции
+        if data_reply and data_reply[0] == 354:
+            smtp.send(".\r\n")
+            smtp.getreply()
+        smtp.rset()
+
+    code, resp = mail_reply
+    if code != 250:
+        abort()
+        raise smtplib.SMTPSenderRefused(code, resp, sender)
+
+    refused = {
+        recipient: (code, resp)
+        for recipient, (code, resp) in zip(recipients, rcpt_replies)
+        if code not in (250, 251)
+    }
+    if len(refused) == len(recipients):
+        abort()
+        raise smtplib.SMTPRecipientsRefused(refused)
+
+    code, resp = data_reply
+    if code != 354:
+        smtp.rset()
+        raise smtplib.SMTPDataError(code, resp)
+
+    file_attachment = _file_attachment_class()
+    streamed = {
+        id(part): part for part in message.walk() if isinstance(part, file_attachment)
+    }
+
+    if eight_bit and message.is_multipart():
+        # Копия письма с текстом в 8bit: части копии общие с исходным
+        # письмом, само оно не изменяется (см. clone_for_recipient)
+        text_part = _text_part_class()
+        parts = [
+            part.as_8bit() if isinstance(part, text_part) else part
+            for part in message.get_payload()
+        ]
+        message = copy.copy(message)
+        message.set_payload(parts)
+
+    class StreamingGenerator(BytesGenerator):
+        # Вместо содержимого больших вложений пишет строку-метку,
+        # которая при отправке заменяется данными из файла
+        def _dispatch(self, msg):
+            if isinstance(msg, file_attachment):
+                self.write(f"{_STREAM_MARKER.decode()}{id(msg)}{self._NL}")
+            else:
+                super()._dispatch(msg)
+
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE) as spool:
+        writer = _DotStuffingWriter(spool)
+        generator = StreamingGenerator(writer, mangle_from_=False)
+        generator.flatten(message, linesep="\r\n")
+
+        # Временный файл, перешедший на диск, без шифрования передается
+        # через sendfile: данные идут из файла в сокет, минуя процесс
+        spool.flush()
+        size = writer.tell()
+        use_sendfile = size > _SPOOL_MAX_SIZE and not isinstance(smtp, smtplib.SMTP_SSL)
+
+        offset = 0
+        for start, end, part_id in writer.markers:
+            _send_spool_range(smtp, spool, offset, start - offset, use_sendfile)
+            for block in streamed[part_id].iter_base64():
+                smtp.sock.sendall(block)
+            offset = end
+        _send_spool_range(smtp, spool, offset, size - offset, use_sendfile)
+        smtp.sock.sendall(b".\r\n" if writer.at_line_start else b"\r\n.\r\n")
+
+    try:
+        code, resp = smtp.getreply()
+    except smtplib.SMTPServerDisconnected as e:
+        # Письмо передано целиком: повторная отправка может дать дубликат
+        raise DeliveryUnknownError(
+            "Соединение закрыто после передачи письма, письмо могло быть "
+            f"доставлено: {e}"
+        ) from e
+    if code != 250:
+        smtp.rset()
+        raise smtplib.SMTPDataError(code, resp)
+    if refused:
+        logger.warning("Сервер отклонил часть получателей: %s", ", ".join(refused))
+
+
+@lru_cache(maxsize=None)
+def get_ssl_context(verify: bool = True) -> "ssl.SSLContext":
+    """
+    Возвращает общий SSL контекст для всех SMTP соединений.
+
+    Args:
+        verify (bool): Проверять сертификат сервера и имя хоста
+
+    Returns:
+        ssl.SSLContext: Контекст с проверкой сертификата сервера
+        (без проверки при verify=False, см. --insecure)
+
+    Note:
+        Контекст создается при первом SSL подключении: сертификаты
+        удостоверяющих центров загружаются один раз за запуск, а повторные
+        подключения к тому же серверу могут возобновлять TLS сессию
+    """
+    import ssl
+
+    context = ssl.create_default_context()
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class SMTPSession:
+    """
+    Сессия SMTP: одно соединение и одна аутентификация на несколько писем.
+
+    Args:
+        server (str): Адрес SMTP сервера
+        port (int): Порт SMTP сервера
+        use_ssl (bool): Использовать SSL/TLS соединение
+        auth (str, optional): Данные аутентификации в формате "логин:пароль"
+        auth_file (Path, optional): Путь к файлу с данными аутентификации
+        timeout (float): Таймаут соединения в секундах
+        verify (bool): Проверять сертификат сервера при SSL соединении
+
+    Raises:
+        AuthError: Если не удалось пройти аутентификацию на сервере
+
+    Examples:
+        >>> with SMTPSession("smtp.example.com", 465, True) as session:  # doctest: +SKIP
+        ...     session.send(message)
+
+    Note:
+        Соединение закрывается при выходе из блока with
+    """
+
+    def __init__(
+        self,
+        server: str,
+        port: int,
+        use_ssl: bool,
+        auth: Optional[str] = None,
+        auth_file: Optional[Path] = None,
+        timeout: float = 5,
+        verify: bool = True,
+    ) -> None:
+        self.server = server
+        self.port = port
+        self.use_ssl = use_ssl
+        self.auth = auth
+        self.auth_file = auth_file
+        self.timeout = timeout
+        self.verify = verify
+        self.smtp = None
+        self.sent = 0  # Количество писем, отправленных через соединение
+        self._credentials = None
+        self._last_used = time.monotonic()
+
+    def __enter__(self) -> "SMTPSession":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def connect(self) -> None:
+        """
+        Устанавливает соединение с сервером и выполняет аутентификацию.
+
+        Raises:
+            AuthError: Если не удалось пройти аутентификацию на сервере
+        """
+        import smtplib
+
+        logger.info(
+            "Подключение к SMTP серверу %s:%s (SSL: %s)",
+            self.server,
+            self.port,
+            self.use_ssl,
+        )
+        if self.use_ssl:
+            self.smtp = smtplib.SMTP_SSL(
+                self.server,
+                self.port,
+                timeout=self.timeout,
+                context=get_ssl_context(self.verify),
+            )
+        else:
+            self.smtp = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+
+        try:
+            self._login()
+        except Exception:
+            self.close()
+            raise
+
+    def _login(self) -> None:
+        """Выполняет аутентификацию, если переданы данные для неё."""
+        if not (self.auth or self.auth_file):
+            return
+
+        # Файл авторизации читается один раз, при повторных подключениях
+        # используются сохраненные данные
+        if self._credentials is None:
+            if self.auth:
+                self._credentials = tuple(self.auth.split(":", 1))
+                logger.debug("Используется аутентификация через аргументы")
+            else:
+                self._credentials = read_auth_from_file(self.auth_file)
+        username, password = self._credentials
+
+        import smtplib
+
+        try:
+            self.smtp.login(username, password)
+            logger.info("Успешная аутентификация на SMTP сервере")
+        except smtplib.SMTPAuthenticationError as e:
+            raise AuthError(f"Ошибка аутентификации: {str(e)}")
+        except Exception as e:
+            logger.debug("Подробности ошибки аутентификации", exc_info=True)
+            raise AuthError(f"Ошибка при аутентификации: {str(e)}")
+
+    def send(self, message: "MIMEMultipart") -> None:
+        """
+        Отправляет письмо через открытое соединение.
+
+        Args:
+            message (MIMEMultipart): Сформированное MIME сообщение
+
+        Note:
+            Если соединение простаивало дольше _SMTP_IDLE_CHECK секунд
+            или через него отправлено очередные _SMTP_NOOP_EVERY писем,
+            перед отправкой оно проверяется командой NOOP и при
+            необходимости открывается заново
+        """
+        idle = time.monotonic() - self._last_used
+        check = idle > _SMTP_IDLE_CHECK or self.sent % _SMTP_NOOP_EVERY == 0
+        if self.sent and check and not self.is_alive():
+            logger.info("SMTP соединение закрыто сервером, переподключение")
+            self.close()
+            self.connect()
+        stream_send(self.smtp, message)
+        self.sent += 1
+        self._last_used = time.monotonic()
+        logger.info(
+            "Письмо успешно отправлено от %s к %s", message["From"], message["To"]
+        )
+
+    def is_alive(self) -> bool:
+        """
+        Проверяет, что соединение с сервером еще активно (команда NOOP).
+
+        Returns:
+            bool: True если сервер отвечает на NOOP
+        """
+        if not self.smtp:
+            return False
+        try:
+            alive = self.smtp.noop()[0] == 250
+        except Exception:
+            return False
+        if alive:
+            # Успешный NOOP сбрасывает отсчет простоя для проверки в send
+            self._last_used = time.monotonic()
+        return alive
+
+    def close(self) -> None:
+        """Закрывает соединение с сервером, если оно открыто."""
+        if self.smtp:
+            try:
+                self.smtp.quit()
+            except Exception as e:
+                logger.warning("Ошибка при закрытии SMTP соединения: %s", e)
+            finally:
+                self.smtp = None
+
+
+class SMTPPool:
+    """
+    Пул SMTP соединений для многократной отправки писем из одного процесса.
+
+    Args:
+        server (str): Адрес SMTP сервера
+        port (int): Порт SMTP сервера
+        use_ssl (bool): Использовать SSL/TLS соединение
+        auth (str, optional): Данные аутентификации в формате "логин:пароль"
+        auth_file (Path, optional): Путь к файлу с данными аутентификации
+        max_connections (int): Максимальное число одновременно открытых соединений
+        max_messages (int): Число писем, после которого соединение пересоздается
+        verify (bool): Проверять сертификат сервера при SSL соединении
+
+    Examples:
+        >>> pool = SMTPPool("smtp.example.com", 465, True, auth="user:password")
+        >>> pool.send(message)  # doctest: +SKIP
+        >>> pool.close()
+
+    Note:
+        Потокобезопасен: каждый поток получает собственное соединение
+        Соединение, простаивавшее дольше _SMTP_IDLE_CHECK секунд, перед
+        повторным использованием проверяется командой NOOP
+    """
+
+    def __init__(
+        self,
+        server: str,
+        port: int,
+        use_ssl: bool,
+        auth: Optional[str] = None,
+        auth_file: Optional[Path] = None,
+        max_connections: int = 5,
+        max_messages: int = 100,
+        verify: bool = True,
+    ) -> None:
+        self.server = server
+        self.port = port
+        self.use_ssl = use_ssl
+        self.auth = auth
+        self.max_messages = max_messages
+        self.verify = verify
+        self._idle = queue.Queue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._credentials = None
+        if auth_file:
+            self._credentials = read_auth_from_file(auth_file)
+
+    def _new_session(self) -> SMTPSession:
+        """Создает и открывает новое соединение с сервером."""
+        session = SMTPSession(
+            self.server, self.port, self.use_ssl, self.auth, verify=self.verify
+        )
+        session._credentials = self._credentials
+        session.connect()
+        return session
+
+    @contextmanager
+    def acquire(self) -> Iterator[SMTPSession]:
+        """
+        Выдает соединение из пула на время блока with.
+
+        Yields:
+            SMTPSession: Открытое соединение с сервером
+
+        Note:
+            Соединение с ошибкой или исчерпавшее лимит писем закрывается
+        """
+        self._slots.acquire()
+        session = None
+        try:
+            try:
+                session = self._idle.get_nowait()
+                idle = time.monotonic() - session._last_used
+                if idle > _SMTP_IDLE_CHECK and not session.is_alive():
+                    logger.debug("SMTP соединение из пула устарело, переподключение")
+                    session.close()
+                    session = None
+            except queue.Empty:
+                pass
+            if session is None:
+                session = self._new_session()
+
+            try:
+                yield session
+            except Exception:
+                session.close()
+                raise
+
+            if session.sent >= self.max_messages:
+                session.close()
+            else:
+                self._idle.put(session)
+        finally:
+            self._slots.release()
+
+    def send(self, message: "MIMEMultipart") -> None:
+        """
+        Отправляет письмо через свободное соединение пула.
+
+        Args:
+            message (MIMEMultipart): Сформированное MIME сообщение
+        """
+        with self.acquire() as session:
+            session.send(message)
+
+    def close(self) -> None:
+        """Закрывает все простаивающие соединения пула."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def send_parallel(
+    pool: SMTPPool, messages: Iterable["MIMEMultipart"], workers: int
+) -> None:
+    """
+    Отправляет письма параллельно через несколько соединений пула.
+
+    Args:
+        pool (SMTPPool): Пул соединений (не менее workers соединений)
+        messages (Iterable[MIMEMultipart]): Сформированные MIME сообщения
+        workers (int): Число потоков отправки
+
+    Raises:
+        Exception: Первая ошибка отправки или формирования писем
+
+    Note:
+        Письма забираются из messages в текущем потоке, поэтому генератор
+        писем не обязан быть потокобезопасным. В очереди на отправку
+        находится не более 2 * workers писем. Если сервер закрыл
+        соединение до приема письма, оно один раз отправляется повторно
+        через новое; после передачи письма (DeliveryUnknownError) повтора
+        нет, чтобы получатель не получил дубликат
+    """
+    import smtplib
+
+    def worker_send(message: "MIMEMultipart") -> None:
+        try:
+            pool.send(message)
+        except smtplib.SMTPServerDisconnected:
+            logger.info("SMTP соединение закрыто сервером, повторная отправка")
+            pool.send(message)
+
+    pending = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for message in messages:
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit(worker_send, message))
+            for future in pending:
+                future.result()
+        except Exception:
+            for future in pending:
+                future.cancel()
+            raise
+
+
+def send_many(
+    server: str,
+    port: int,
+    messages: Iterable["MIMEMultipart"],
+    use_ssl: bool,
+    auth: Optional[str] = None,
+    auth_file: Optional[Path] = None,
+    workers: int = 1,
+    verify: bool = True,
+) -> int:
+    """
+    Отправляет несколько писем через одно SMTP соединение.
+
+    Args:
+        server (str): Адрес SMTP сервера
+        port (int): Порт SMTP сервера
+        messages (Iterable[MIMEMultipart]): Сформированные MIME сообщения
+        use_ssl (bool): Использовать SSL/TLS соединение
+        auth (str, optional): Данные аутентификации в формате "логин:пароль"
+        auth_file (Path, optional): Путь к файлу с данными аутентификации
+        workers (int): Число параллельных соединений (см. send_parallel)
+        verify (bool): Проверять сертификат сервера при SSL соединении
+
+    Returns:
+        int: Код возврата (EXIT_SUCCESS при успешной отправке всех писем)
+
+    Note:
+        Подключение и аутентификация выполняются один раз на все письма
+        (при workers > 1 - один раз на каждое соединение)
+        Письма могут формироваться лениво (генератором): ошибка чтения
+        вложений (FileReadError) возвращает EXIT_ATTACHMENT_ERROR
+        Отправка прерывается на первой ошибке
+    """
+    import smtplib
+    import ssl
+
+    try:
+        if workers > 1:
+            pool = SMTPPool(
+                server,
+                port,
+                use_ssl,
+                auth,
+                auth_file,
+                max_connections=workers,
+                verify=verify,
+            )
+            try:
+                send_parallel(pool, messages, workers)
+            finally:
+                pool.close()
+            return EXIT_SUCCESS
+
+        with SMTPSession(
+            server, port, use_ssl, auth, auth_file, verify=verify
+        ) as session:
+            for message in messages:
+                session.send(message)
+        return EXIT_SUCCESS
+
+    except AuthError as e:
+        logger.error(str(e))
+        return EXIT_SMTP_AUTH_ERROR
+    except FileReadError as e:
+        logger.error(str(e))
+        return EXIT_ATTACHMENT_ERROR
+    except DeliveryUnknownError as e:
+        logger.error(str(e))
+        return EXIT_SMTP_SEND_ERROR
+    except smtplib.SMTPConnectError as e:
+        logger.error("Ошибка подключения к SMTP серверу: %s", e)
+        return EXIT_SMTP_CONNECTION_ERROR
+    except ssl.CertificateError as e:
+        # В Python 3.7+ это ssl.SSLCertVerificationError
+        logger.error(
+            "Ошибка проверки сертификата SMTP сервера: %s "
+            "(для отключения проверки используйте --insecure)",
+            e,
+        )
+        return EXIT_SMTP_CONNECTION_ERROR
+    except smtplib.SMTPHeloError as e:
+        logger.error("Ошибка приветствия SMTP сервера: %s", e)
+        return EXIT_SMTP_CONNECTION_ERROR
+    except smtplib.SMTPDataError as e:
+        logger.error("Ошибка данных SMTP: %s", e)
+        return EXIT_SMTP_SEND_ERROR
+    except smtplib.SMTPException as e:
+        logger.error("Ошибка SMTP: %s", e, exc_info=True)
+        return EXIT_SMTP_SEND_ERROR
+    except Exception as e:
+        logger.error("Неизвестная ошибка при отправке письма: %s", e, exc_info=True)
+        return EXIT_UNKNOWN_ERROR
 
 
 def send_email(
@@ -232,10 +1541,11 @@ def send_email(
     port: int,
     sender: str,
     recipient: str,
-    message: MIMEMultipart,
+    message: "MIMEMultipart",
     use_ssl: bool,
     auth: Optional[str] = None,
-    auth_file: Optional[argparse.FileType] = None,
+    auth_file: Optional[Path] = None,
+    verify: bool = True,
 ) -> int:
     """
     Отправляет письмо через SMTP сервер.
@@ -248,67 +1558,138 @@ def send_email(
         message (MIMEMultipart): Сформированное MIME сообщение
         use_ssl (bool): Использовать SSL/TLS соединение
         auth (str, optional): Данные аутентификации в формате "логин:пароль"
-        auth_file (file, optional): Файл с данными аутентификации
+        auth_file (Path, optional): Путь к файлу с данными аутентификации
+        verify (bool): Проверять сертификат сервера при SSL соединении
 
     Returns:
         int: Код возврата (EXIT_SUCCESS при успешной отправке)
 
     Note:
-        Поддерживает как SSL так и обычное соединение
-        Обрабатывает различные ошибки SMTP и возвращает соответствующие коды
+        Частный случай send_many для одного письма
         Всегда закрывает соединение с сервером при завершении
     """
-    smtp_server = None
-    try:
-        logger.info(f"Подключение к SMTP серверу {server}:{port} (SSL: {use_ssl})")
-        timeout_seconds = 5  # Таймаут соединения в секундах
-        if use_ssl:
-            smtp_server = smtplib.SMTP_SSL(server, port, timeout=timeout_seconds)
-        else:
-            smtp_server = smtplib.SMTP(server, port, timeout=timeout_seconds)
+    logger.debug("Отправка письма от %s к %s", sender, recipient)
+    return send_many(server, port, [message], use_ssl, auth, auth_file, verify=verify)
 
-        if auth or auth_file:
-            if auth:
-                username, password = auth.split(":")
-                logger.debug("Используется аутентификация через аргументы")
-            elif auth_file:
-                username, password = read_auth_from_file(auth_file)
 
-            try:
-                smtp_server.login(username, password)
-                logger.info("Успешная аутентификация на SMTP сервере")
-            except smtplib.SMTPAuthenticationError as e:
-                logger.error(f"Ошибка аутентификации: {str(e)}")
-                return EXIT_SMTP_AUTH_ERROR
-            except Exception as e:
-                logger.error(f"Ошибка при аутентификации: {str(e)}", exc_info=True)
-                return EXIT_SMTP_AUTH_ERROR
+async def send_email_async(
+    server: str,
+    port: int,
+    message: "MIMEMultipart",
+    use_ssl: bool,
+    credentials: Optional[Tuple[str, str]] = None,
+    verify: bool = True,
+) -> int:
+    """
+    Асинхронно отправляет письмо через SMTP сервер (требуется aiosmtplib).
 
-        smtp_server.send_message(message)
-        logger.info(f"Письмо успешно отправлено от {sender} к {recipient}")
-        return EXIT_SUCCESS
+    Args:
+        server (str): Адрес SMTP сервера
+        port (int): Порт SMTP сервера
+        message (MIMEMultipart): Сформированное MIME сообщение
+        use_ssl (bool): Использовать SSL/TLS соединение
+        credentials (Tuple[str, str], optional): Логин и пароль
+        verify (bool): Проверять сертификат сервера при SSL соединении
 
-    except smtplib.SMTPConnectError as e:
-        logger.error(f"Ошибка подключения к SMTP серверу: {str(e)}")
-        return EXIT_SMTP_CONNECTION_ERROR
-    except smtplib.SMTPHeloError as e:
-        logger.error(f"Ошибка приветствия SMTP сервера: {str(e)}")
+    Returns:
+        int: Код возврата (EXIT_SUCCESS при успешной отправке)
+
+    Raises:
+        EmailSenderError: Если пакет aiosmtplib не установлен
+    """
+    try:
+        import aiosmtplib
+    except ImportError:
+        raise EmailSenderError("Для асинхронной отправки требуется пакет aiosmtplib")
+
+    username, password = credentials if credentials else (None, None)
+    try:
+        await aiosmtplib.send(
+            message,
+            hostname=server,
+            port=port,
+            username=username,
+            password=password,
+            use_tls=use_ssl,
+            tls_context=get_ssl_context(verify) if use_ssl else None,
+            timeout=5,
+        )
+        logger.info(
+            "Письмо успешно отправлено от %s к %s", message["From"], message["To"]
+        )
+        return EXIT_SUCCESS
+    except aiosmtplib.SMTPAuthenticationError as e:
+        logger.error("Ошибка аутентификации: %s", e)
+        return EXIT_SMTP_AUTH_ERROR
+    except aiosmtplib.SMTPConnectError as e:
+        logger.error("Ошибка подключения к SMTP серверу: %s", e)
         return EXIT_SMTP_CONNECTION_ERROR
-    except smtplib.SMTPDataError as e:
-        logger.error(f"Ошибка данных SMTP: {str(e)}")
-        return EXIT_SMTP_SEND_ERROR
-    except smtplib.SMTPException as e:
-        logger.error(f"Ошибка SMTP: {str(e)}", exc_info=True)
+    except aiosmtplib.SMTPException as e:
+        logger.error("Ошибка SMTP: %s", e)
         return EXIT_SMTP_SEND_ERROR
     except Exception as e:
-        logger.error(f"Неизвестная ошибка при отправке письма: {str(e)}", exc_info=True)
+        logger.error("Неизвестная ошибка при отправке письма: %s", e, exc_info=True)
         return EXIT_UNKNOWN_ERROR
-    finally:
-        if smtp_server:
-            try:
-                smtp_server.quit()
-            except Exception as e:
-                logger.warning(f"Ошибка при закрытии SMTP соединения: {str(e)}")
+
+
+async def send_many_async(
+    server: str,
+    port: int,
+    messages: Iterable["MIMEMultipart"],
+    use_ssl: bool,
+    auth: Optional[str] = None,
+    auth_file: Optional[Path] = None,
+    verify: bool = True,
+    max_connections: int = 5,
+) -> int:
+    """
+    Асинхронно и параллельно отправляет несколько писем (требуется aiosmtplib).
+
+    Args:
+        server (str): Адрес SMTP сервера
+        port (int): Порт SMTP сервера
+        messages (Iterable[MIMEMultipart]): Сформированные MIME сообщения
+        use_ssl (bool): Использовать SSL/TLS соединение
+        auth (str, optional): Данные аутентификации в формате "логин:пароль"
+        auth_file (Path, optional): Путь к файлу с данными аутентификации
+        verify (bool): Проверять сертификат сервера при SSL соединении
+        max_connections (int): Максимальное число одновременно открытых
+            соединений
+
+    Returns:
+        int: EXIT_SUCCESS или код первой из возникших ошибок
+
+    Note:
+        Каждое письмо отправляется через собственное соединение, но
+        одновременно открыто не больше max_connections соединений:
+        серверы ограничивают число подключений с одного адреса
+        Письма забираются из messages по мере отправки, поэтому генератор
+        писем не формирует их все заранее
+    """
+    import asyncio
+
+    credentials = None
+    if auth:
+        credentials = tuple(auth.split(":", 1))
+    elif auth_file:
+        credentials = read_auth_from_file(auth_file)
+
+    results = {}
+    numbered = enumerate(messages)
+
+    async def worker() -> None:
+        # Итератор общий для всех задач: следующее письмо берет
+        # освободившаяся задача
+        for number, message in numbered:
+            results[number] = await send_email_async(
+                server, port, message, use_ssl, credentials, verify
+            )
+
+    await asyncio.gather(*(worker() for _ in range(max(1, max_connections))))
+    return next(
+        (results[n] for n in sorted(results) if results[n] != EXIT_SUCCESS),
+        EXIT_SUCCESS,
+    )
 
 
 def read_auth_from_file(auth_file):
@@ -316,7 +1697,7 @@ def read_auth_from_file(auth_file):
     Читает данные аутентификации из файла.
 
     Args:
-        auth_file (file): Открытый файловый объект
+        auth_file (Path | str | file): Путь к файлу или открытый файловый объект
 
     Returns:
         tuple: (username, password)
@@ -325,11 +1706,22 @@ def read_auth_from_file(auth_file):
         AuthError: Если формат данных неверный или произошла ошибка чтения
 
     Note:
-        Закрывает файл после чтения
+        Файл по пути читается одним вызовом os.read, без буферизованного
+        файлового объекта. Переданный файловый объект закрывается после чтения
+        Путь "-" означает стандартный ввод (как у argparse.FileType)
     """
+    if isinstance(auth_file, (str, os.PathLike)) and os.fspath(auth_file) == "-":
+        auth_file = sys.stdin
     try:
-        data = auth_file.read().strip()
-        username, password = data.split(":")
+        if isinstance(auth_file, (str, os.PathLike)):
+            fd = os.open(auth_file, os.O_RDONLY)
+            try:
+                data = os.read(fd, _AUTH_FILE_MAX_SIZE).decode("utf-8").strip()
+            finally:
+                os.close(fd)
+        else:
+            data = auth_file.read().strip()
+        username, password = data.split(":", 1)
         logger.info("Данные аутентификации успешно прочитаны из файла")
         return username, password
     except ValueError:
@@ -338,70 +1730,280 @@ def read_auth_from_file(auth_file):
         )
         raise AuthError("Неверный формат данных в файле авторизации")
     except Exception as e:
-        logger.error(f"Ошибка при чтении файла авторизации: {str(e)}")
+        logger.error("Ошибка при чтении файла авторизации: %s", e)
         raise AuthError(f"Ошибка чтения файла авторизации: {str(e)}")
     finally:
-        auth_file.close()
+        if hasattr(auth_file, "close") and auth_file is not sys.stdin:
+            auth_file.close()
 
 
 def generate_default_email_body(
-    file_paths: List[Path], sender: Optional[str] = None
+    file_paths: List[AttachmentSource], sender: Optional[str] = None
 ) -> str:
     """
     Генерирует стандартный текст письма со списком вложений.
 
     Args:
-        file_paths (List[Path]): Список путей к прикрепленным файлам
+        file_paths (List[Path | FileEntry]): Прикрепленные файлы
         sender (str, optional): Email отправителя для подписи
 
     Returns:
         str: Сгенерированный текст письма с подписью
     """
-    body = "Вам отправлены файлы:\n" + "\n".join(
-        f"{i + 1}. {f.name}" for i, f in enumerate(file_paths)
-    )
-    return add_signature(body, sender)
+    lines = ["Вам отправлены файлы:"]
+    lines.extend([f"{i}. {f.name}" for i, f in enumerate(file_paths, 1)])
+    return add_signature("\n".join(lines), sender)
 
 
-def get_email_body(args: argparse.Namespace, file_paths: List[Path]) -> str:
+def get_email_text(args: "argparse.Namespace") -> Optional[str]:
     """
     Определяет текст письма согласно приоритетам источников.
 
     Приоритеты:
     1. Текст из файла (--text-file)
     2. Текст из аргумента (--text)
-    3. Автогенерированный текст со списком файлов
+    3. Автогенерированный текст со списком файлов (возвращается None)
 
     Args:
         args (argparse.Namespace): Аргументы командной строки
-        file_paths (List[Path]): Список путей к файлам
 
     Returns:
-        str: Текст письма с подписью
+        str: Текст письма без подписи или None, если текст нужно
+        сгенерировать по списку вложений (см. generate_default_email_body)
 
     Note:
         Логирует используемый источник текста письма
+        Вызывается один раз за запуск: файл с текстом не перечитывается
+        для каждого письма
     """
     if args.text_file:
         try:
-            body = read_text_file(args.text_file)
-            return add_signature(body, args.sender)
+            return read_text_file(args.text_file)
         except FileReadError as e:
-            logger.warning(f"Не удалось прочитать файл с текстом: {str(e)}")
+            logger.warning("Не удалось прочитать файл с текстом: %s", e)
         except Exception as e:
-            logger.warning(f"Ошибка чтения файла с текстом: {str(e)}")
+            logger.warning("Ошибка чтения файла с текстом: %s", e)
 
     if args.text:
         logger.info("Используется текст из аргумента --text")
-        return add_signature(args.text, args.sender)
+        return args.text
 
     logger.info("Используется автосгенерированный текст письма")
+    return None
+
+
+def get_email_body(
+    args: "argparse.Namespace", file_paths: List[AttachmentSource]
+) -> str:
+    """
+    Определяет текст письма согласно приоритетам источников.
+
+    Args:
+        args (argparse.Namespace): Аргументы командной строки
+        file_paths (List[Path | FileEntry]): Прикрепленные файлы
+
+    Returns:
+        str: Текст письма с подписью
+
+    Note:
+        Приоритеты источников описаны в get_email_text
+    """
+    text = get_email_text(args)
+    if text is not None:
+        return add_signature(text, args.sender)
     return generate_default_email_body(file_paths, args.sender)
 
 
+def split_attachments(
+    file_paths: List[AttachmentSource], max_bytes: int = MAX_ATTACHMENT_BYTES
+) -> List[List[AttachmentSource]]:
+    """
+    Разбивает список вложений на группы ограниченного суммарного размера.
+
+    Args:
+        file_paths (List[Path | FileEntry]): Файлы для вложения
+            (для FileEntry размер берется без stat())
+        max_bytes (int): Максимальный размер письма с вложениями группы
+            (после кодирования в base64). 0 - не разбивать
+
+    Returns:
+        List[List[Path | FileEntry]]: Группы файлов, по одной на письмо
+
+    Note:
+        Порядок файлов сохраняется. Файл, который сам по себе больше
+        max_bytes, отправляется отдельным письмом
+        Размер вложения считается в закодированном виде
+        (см. _attachment_wire_size), на заголовки и текст письма
+        резервируется _MESSAGE_OVERHEAD байт
+    """
+    if max_bytes <= 0:
+        return [file_paths]
+
+    limit = max_bytes - _MESSAGE_OVERHEAD
+    groups = []
+    current = []
+    current_size = 0
+    for path in file_paths:
+        size = _attachment_wire_size(as_file_entry(path).size)
+        if current and current_size + size > limit:
+            groups.append(current)
+            current = []
+            current_size = 0
+        current.append(path)
+        current_size += size
+    if current:
+        groups.append(current)
+    return groups
+
+
+def build_messages(
+    args: "argparse.Namespace",
+    file_groups: List[List[AttachmentSource]],
+    recipients: List[str],
+    text: Optional[str],
+) -> Iterator["MIMEMultipart"]:
+    """
+    Последовательно формирует письма, по одному на каждую группу вложений
+    и каждого получателя.
+
+    Args:
+        args (argparse.Namespace): Аргументы командной строки
+        file_groups (List[List[Path | FileEntry]]): Группы файлов
+            (см. split_attachments)
+        recipients (List[str]): Email адреса получателей
+        text (str, optional): Текст письма (см. get_email_text); None -
+            текст генерируется по вложениям каждого письма
+
+    Yields:
+        MIMEMultipart: Готовое письмо с вложениями
+
+    Raises:
+        FileReadError: Если не удалось добавить вложения
+        EmailSenderError: Если произошла ошибка при создании сообщения
+
+    Note:
+        Если групп вложений несколько, к теме добавляется номер "(i/n)".
+        Письма формируются по мере отправки, поэтому в памяти
+        одновременно находятся вложения только одной группы.
+        Вложения кодируются один раз, письма остальным получателям -
+        копии первого (см. clone_for_recipient)
+    """
+    total = len(file_groups)
+    for number, group in enumerate(file_groups, 1):
+        subject = args.subject
+        if total > 1:
+            subject = f"{args.subject} ({number}/{total})"
+        if text is not None:
+            body = add_signature(text, args.sender)
+        else:
+            body = generate_default_email_body(group, args.sender)
+        message = create_message(
+            args.sender or ADMIN_MAIL, recipients[0], subject, body
+        )
+        if not attach_files(message, group, fail_fast=True):
+            raise FileReadError("Ошибка при добавлении одного или нескольких вложений")
+        yield message
+        for recipient in recipients[1:]:
+            yield clone_for_recipient(message, recipient)
+
+
+def parse_batch_file(
+    batch_path: Path,
+) -> Tuple[List[Tuple[str, List[FileEntry]]], int]:
+    """
+    Разбирает файл пакетной отправки.
+
+    Каждая непустая строка описывает отдельное письмо в формате
+    "получатель,файл[,файл...]".
+
+    Args:
+        batch_path (Path): Путь к файлу пакетной отправки
+
+    Returns:
+        Tuple[List[Tuple[str, List[FileEntry]]], int]: Кортеж (список пар
+        (получатель, файлы вложений), код ошибки)
+
+    Note:
+        Проверяет адреса получателей и доступность всех файлов до начала
+        отправки, чтобы ошибка в середине списка не прерывала рассылку
+    """
+    if not validate_file_path(batch_path):
+        return [], EXIT_FILE_NOT_FOUND
+
+    try:
+        lines = read_lines(batch_path)
+    except Exception as e:
+        logger.error("Ошибка при чтении файла пакетной отправки: %s", e)
+        return [], EXIT_FILE_READ_ERROR
+
+    jobs = []
+    checked = {}
+    for number, line in enumerate(lines, 1):
+        fields = [field.strip() for field in line.split(",")]
+        fields = [field for field in fields if field]
+        if not fields:
+            continue
+
+        recipient = fields[0]
+        if not validate_email(recipient):
+            logger.error(
+                "Невалидный email получателя в строке %s: %s", number, recipient
+            )
+            return [], EXIT_INVALID_EMAIL
+
+        if len(fields) < 2:
+            logger.error("Не указаны файлы для отправки в строке %s", number)
+            return [], EXIT_NO_FILES
+        entries = []
+        for field in fields[1:]:
+            entry = _get_file_entry_cached(field, checked)
+            if entry is None:
+                return [], EXIT_FILE_NOT_FOUND
+            entries.append(entry)
+        jobs.append((recipient, entries))
+
+    if not jobs:
+        logger.error("Файл пакетной отправки не содержит писем")
+        return [], EXIT_NO_FILES
+
+    logger.info("Прочитано %s писем из файла пакетной отправки", len(jobs))
+    return jobs, EXIT_SUCCESS
+
+
+def build_batch_messages(
+    args: "argparse.Namespace",
+    jobs: List[Tuple[str, List[FileEntry]]],
+    text: Optional[str],
+) -> Iterator["MIMEMultipart"]:
+    """
+    Последовательно формирует письма пакетной отправки.
+
+    Args:
+        args (argparse.Namespace): Аргументы командной строки
+        jobs (List[Tuple[str, List[FileEntry]]]): Пары (получатель, файлы),
+            см. parse_batch_file
+        text (str, optional): Текст письма (см. get_email_text)
+
+    Yields:
+        MIMEMultipart: Готовое письмо с вложениями
+
+    Raises:
+        FileReadError: Если не удалось добавить вложения
+        EmailSenderError: Если произошла ошибка при создании сообщения
+
+    Note:
+        Вложения каждой строки разбиваются на письма не больше
+        --max-size, как и при обычной отправке (см. build_messages)
+    """
+    max_bytes = args.max_size * 1024 * 1024
+    for recipient, file_paths in jobs:
+        file_groups = split_attachments(file_paths, max_bytes)
+        yield from build_messages(args, file_groups, [recipient], text)
+
+
 def parse_file_paths(
     file_paths_str: str, files_list_path: Optional[Path] = None
-) -> Tuple[List[Path], int]:
+) -> Tuple[List[FileEntry], int]:
     """
     Разбирает пути к файлам из строки или файла со списком.
 
@@ -410,32 +2012,36 @@ def parse_file_paths(
         files_list_path (Path, optional): Путь к файлу со списком файлов
 
     Returns:
-        Tuple[List[Path], int]: Кортеж (список файлов, код ошибки)
+        Tuple[List[FileEntry], int]: Кортеж (список файлов, код ошибки)
 
     Note:
         Проверяет существование и доступность каждого файла
         Возвращает код ошибки если файлы не найдены или недоступны
+        Данные stat, полученные при проверке, сохраняются в FileEntry
+        и используются дальше без повторных обращений к файлам
     """
     file_paths = []
+    checked = {}
 
     if files_list_path:
         if not validate_file_path(files_list_path):
             return [], EXIT_FILE_NOT_FOUND
 
         try:
-            with files_list_path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        path = Path(line)
-                        if not validate_file_path(path):
-                            return [], EXIT_FILE_NOT_FOUND
-                        file_paths.append(path)
-            logger.info(f"Прочитано {len(file_paths)} файлов из списка")
+            lines = [line.strip() for line in read_lines(files_list_path)]
         except Exception as e:
-            logger.error(f"Ошибка при чтении файла со списком: {str(e)}")
+            logger.error("Ошибка при чтении файла со списком: %s", e)
             return [], EXIT_FILE_READ_ERROR
 
+        for line in lines:
+            if not line:
+                continue
+            entry = _get_file_entry_cached(line, checked)
+            if entry is None:
+                return [], EXIT_FILE_NOT_FOUND
+            file_paths.append(entry)
+        logger.info("Прочитано %s файлов из списка", len(file_paths))
+
         if not file_paths:
             logger.error("Файл со списком не содержит валидных файлов")
             return [], EXIT_NO_FILES
@@ -451,19 +2057,24 @@ def parse_file_paths(
         if not file_path:
             continue
 
-        path = Path(file_path)
-        if not validate_file_path(path):
+        entry = _get_file_entry_cached(file_path, checked)
+        if entry is None:
             return [], EXIT_FILE_NOT_FOUND
-        file_paths.append(path)
+        file_paths.append(entry)
 
     if not file_paths:
         logger.error("Не указаны валидные файлы для отправки")
         return [], EXIT_NO_FILES
 
-    logger.info(f"Подготовлено {len(file_paths)} файлов для отправки")
+    logger.info("Подготовлено %s файлов для отправки", len(file_paths))
     return file_paths, EXIT_SUCCESS
 
 
+# Обработчик очереди и поток записи логов, созданные setup_logging
+_log_handler = None
+_log_listener = None
+
+
 def setup_logging(log_file: Optional[str] = None) -> None:
     """
     Настраивает систему логирования.
@@ -474,26 +2085,63 @@ def setup_logging(log_file: Optional[str] = None) -> None:
     Note:
         Если log_file не указан, но параметр --log передан без значения,
         используется DEFAULT_LOGFILE
+        Записи передаются через очередь в фоновый поток (QueueListener),
+        поэтому запись на диск не блокирует отправку письма
+        Корневой логгер тоже пишет в очередь (для сообщений библиотек),
+        логгер модуля send2mail - напрямую, без передачи корневому
+        Повторный вызов заменяет прежнюю настройку, а не добавляет
+        еще один обработчик
     """
+    from logging.handlers import QueueHandler, QueueListener
+
+    global _log_handler, _log_listener
+    if _log_listener is not None:
+        logger.removeHandler(_log_handler)
+        logging.getLogger().removeHandler(_log_handler)
+        atexit.unregister(_log_listener.stop)
+        _log_listener.stop()
+
     handlers = [logging.StreamHandler()]
 
     if log_file is not None:  # Если параметр --log был передан (даже без значения)
         try:
             # Используем переданное имя файла или DEFAULT_LOGFILE, если имя не указано
             log_filename = log_file if log_file != "" else DEFAULT_LOGFILE
-            handlers.append(logging.FileHandler(log_filename))
-            logger.info(f"Логирование настроено, файл логов: {log_filename}")
+            # delay=True: файл открывается при первой записи, а не сразу
+            handlers.append(logging.FileHandler(log_filename, delay=True))
+            logger.info("Логирование настроено, файл логов: %s", log_filename)
         except Exception as e:
-            logger.error(f"Ошибка настройки файлового логгера: {str(e)}")
+            logger.error("Ошибка настройки файлового логгера: %s", e)
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=handlers,
+    # datefmt без миллисекунд: время форматируется одним вызовом strftime
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
     )
-
-
-def setup_arg_parser() -> argparse.ArgumentParser:
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # QueueHandler только передает текст сообщения, итоговое
+    # форматирование выполняют обработчики в потоке listener
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+
+    # Записи модуля передаются в очередь напрямую, без обхода
+    # иерархии логгеров до корневого
+    logger.setLevel(logging.INFO)
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+    _log_handler = queue_handler
+    _log_listener = listener
+
+
+def setup_arg_parser() -> "argparse.ArgumentParser":
     """
     Создает и настраивает парсер аргументов командной строки.
 
@@ -502,36 +2150,13 @@ def setup_arg_parser() -> argparse.ArgumentParser:
 
     Note:
         Включает подробное описание всех параметров и кодов возврата
+        Каждый вызов создает новый парсер; parse_args использует
+        общий экземпляр (см. get_arg_parser)
     """
-    return_codes_help = """
-Коды возврата:
-  {EXIT_SUCCESS} - Успешное выполнение
-  {EXIT_ARGUMENT_ERROR} - Ошибка в аргументах командной строки
-  {EXIT_FILE_NOT_FOUND} - Файл не найден
-  {EXIT_FILE_READ_ERROR} - Ошибка чтения файла
-  {EXIT_ATTACHMENT_ERROR} - Ошибка прикрепления файлов
-  {EXIT_SMTP_CONNECTION_ERROR} - Ошибка подключения к SMTP серверу
-  {EXIT_SMTP_AUTH_ERROR} - Ошибка аутентификации на SMTP сервере
-  {EXIT_SMTP_SEND_ERROR} - Ошибка отправки письма
-  {EXIT_INVALID_EMAIL} - Невалидный email адрес
-  {EXIT_NO_FILES} - Не указаны файлы для отправки
-  {EXIT_UNKNOWN_ERROR} - Неизвестная ошибка
-""".format(
-        EXIT_SUCCESS=EXIT_SUCCESS,
-        EXIT_ARGUMENT_ERROR=EXIT_ARGUMENT_ERROR,
-        EXIT_FILE_NOT_FOUND=EXIT_FILE_NOT_FOUND,
-        EXIT_FILE_READ_ERROR=EXIT_FILE_READ_ERROR,
-        EXIT_ATTACHMENT_ERROR=EXIT_ATTACHMENT_ERROR,
-        EXIT_SMTP_CONNECTION_ERROR=EXIT_SMTP_CONNECTION_ERROR,
-        EXIT_SMTP_AUTH_ERROR=EXIT_SMTP_AUTH_ERROR,
-        EXIT_SMTP_SEND_ERROR=EXIT_SMTP_SEND_ERROR,
-        EXIT_INVALID_EMAIL=EXIT_INVALID_EMAIL,
-        EXIT_NO_FILES=EXIT_NO_FILES,
-        EXIT_UNKNOWN_ERROR=EXIT_UNKNOWN_ERROR,
-    )
+    import argparse
 
     parser = argparse.ArgumentParser(
-        description="Утилита для отправки писем с вложениями.\n\n" + return_codes_help,
+        description="Утилита для отправки писем с вложениями.\n\n" + _RETURN_CODES_HELP,
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
@@ -543,13 +2168,24 @@ def setup_arg_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Файл со списком файлов для вложения (по одному на строку)",
     )
+    files_group.add_argument(
+        "--batch",
+        type=Path,
+        help="Файл пакетной отправки: отдельное письмо на каждую строку "
+        "вида получатель,файл[,файл...]",
+    )
 
     # Остальные обязательные параметры
     parser.add_argument("-s", "--server", required=True, help="SMTP сервер")
     parser.add_argument(
         "-p", "--port", required=True, type=int, help="Порт SMTP сервера"
     )
-    parser.add_argument("-t", "--to", required=True, help="Email получателя")
+    parser.add_argument(
+        "-t",
+        "--to",
+        help="Email получателя (несколько - через запятую); "
+        "обязателен, если не указан --batch",
+    )
     parser.add_argument(
         "-f",
         "--from",
@@ -566,13 +2202,33 @@ def setup_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-uf",
         "--auth-file",
-        type=argparse.FileType("r"),
+        type=Path,
         help="Файл с данными аутентификации (логин:пароль)",
     )
     parser.add_argument(
         "-u", "--auth", help="Данные аутентификации в формате логин:пароль"
     )
     parser.add_argument("-S", "--ssl", action="store_true", help="Использовать SSL")
+    parser.add_argument(
+        "--insecure",
+        action="store_true",
+        help="Не проверять сертификат SMTP сервера при SSL соединении",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=MAX_ATTACHMENT_BYTES // (1024 * 1024),
+        help="Максимальный размер письма с вложениями в base64, МБ; вложения сверх "
+        "лимита отправляются несколькими письмами, 0 - не разбивать "
+        "(по умолчанию: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Число параллельных соединений с SMTP сервером при отправке "
+        "нескольких писем (по умолчанию: %(default)s)",
+    )
     parser.add_argument(
         "-l",
         "--log",
@@ -583,6 +2239,161 @@ def setup_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
+@lru_cache(maxsize=None)
+def get_arg_parser() -> "argparse.ArgumentParser":
+    """
+    Возвращает парсер аргументов, созданный при первом обращении.
+
+    Returns:
+        argparse.ArgumentParser: Общий экземпляр парсера (см. setup_arg_parser)
+    """
+    return setup_arg_parser()
+
+
+# Параметры командной строки для быстрого разбора без argparse:
+# флаг -> (имя атрибута, вид значения). Должны соответствовать
+# setup_arg_parser
+_FAST_OPTIONS = {
+    "-a": ("files", "str"),
+    "--files": ("files", "str"),
+    "--files-list": ("files_list", "path"),
+    "--batch": ("batch", "path"),
+    "-s": ("server", "str"),
+    "--server": ("server", "str"),
+    "-p": ("port", "int"),
+    "--port": ("port", "int"),
+    "-t": ("to", "str"),
+    "--to": ("to", "str"),
+    "-f": ("sender", "optional"),
+    "--from": ("sender", "optional"),
+    "-j": ("subject", "str"),
+    "--subject": ("subject", "str"),
+    "-b": ("text", "str"),
+    "--text": ("text", "str"),
+    "-bf": ("text_file", "path"),
+    "--text-file": ("text_file", "path"),
+    "-uf": ("auth_file", "path"),
+    "--auth-file": ("auth_file", "path"),
+    "-u": ("auth", "str"),
+    "--auth": ("auth", "str"),
+    "-S": ("ssl", "flag"),
+    "--ssl": ("ssl", "flag"),
+    "--insecure": ("insecure", "flag"),
+    "--max-size": ("max_size", "int"),
+    "--workers": ("workers", "int"),
+    "-l": ("log", "optional"),
+    "--log": ("log", "optional"),
+}
+
+# Значения параметров вида "optional", указанных без значения
+_FAST_OPTIONAL_CONST = {"sender": ADMIN_MAIL, "log": DEFAULT_LOGFILE}
+
+
+def parse_args_fast(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Разбирает типовую командную строку без загрузки argparse.
+
+    Args:
+        argv (List[str]): Аргументы командной строки (без имени скрипта)
+
+    Returns:
+        SimpleNamespace: Аргументы с теми же атрибутами, что дает argparse,
+        или None, если строку нужно разобрать через argparse
+
+    Note:
+        Разбирает только корректные вызовы с известными параметрами.
+        Справка, ошибки, сокращения и прочие случаи возвращают None, чтобы
+        их обработал argparse с его сообщениями и кодами ошибок
+    """
+    args = SimpleNamespace(
+        files=None,
+        files_list=None,
+        batch=None,
+        server=None,
+        port=None,
+        to=None,
+        sender=None,
+        subject="Письмо с вложениями",
+        text=None,
+        text_file=None,
+        auth_file=None,
+        auth=None,
+        ssl=False,
+        insecure=False,
+        max_size=MAX_ATTACHMENT_BYTES // (1024 * 1024),
+        workers=1,
+        log=None,
+    )
+
+    i = 0
+    while i < len(argv):
+        option, has_value, value = argv[i].partition("=")
+        if not option.startswith("--"):
+            option, has_value, value = argv[i], "", ""
+        if option not in _FAST_OPTIONS:
+            return None
+        dest, kind = _FAST_OPTIONS[option]
+        i += 1
+
+        if kind == "flag":
+            if has_value:
+                return None
+            setattr(args, dest, True)
+            continue
+
+        if not has_value:
+            if i < len(argv) and not argv[i].startswith("-"):
+                value = argv[i]
+                i += 1
+            elif kind == "optional":
+                setattr(args, dest, _FAST_OPTIONAL_CONST[dest])
+                continue
+            else:
+                return None
+
+        if kind == "int":
+            # Нестандартные цифры ("²") и прочие ошибки разбирает argparse
+            try:
+                setattr(args, dest, int(value))
+            except ValueError:
+                return None
+        elif kind == "path":
+            setattr(args, dest, Path(value))
+        else:
+            setattr(args, dest, value)
+
+    if args.server is None or args.port is None:
+        return None
+    if (args.to is None) == (args.batch is None):
+        return None
+    sources = (args.files, args.files_list, args.batch)
+    if sum(source is not None for source in sources) != 1:
+        return None
+    return args
+
+
+def parse_args(argv: Optional[List[str]] = None) -> "argparse.Namespace":
+    """
+    Разбирает аргументы командной строки.
+
+    Args:
+        argv (List[str], optional): Аргументы (по умолчанию sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Разобранные аргументы
+
+    Note:
+        Сначала пробует быстрый разбор (parse_args_fast), argparse
+        загружается только для справки, ошибок и нетиповых вызовов
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    args = parse_args_fast(argv)
+    if args is None:
+        args = get_arg_parser().parse_args(argv)
+    return args
+
+
 def main() -> int:
     """
     Основная функция выполнения скрипта.
@@ -591,18 +2402,42 @@ def main() -> int:
         int: Код возврата (EXIT_SUCCESS при успешном выполнении)
 
     Note:
-        Обрабатывает все исключения и возвращает соответствующие коды ошибок
-        Логирует все этапы выполнения и ошибки
+        Разбирает командную строку, настраивает логирование и передает
+        управление main_with_args
     """
     try:
-        parser = setup_arg_parser()
-        args = parser.parse_args()
+        args = parse_args()
 
         # Настройка логирования (делаем это в первую очередь)
         setup_logging(args.log)
+    except Exception as e:
+        logger.critical("Критическая ошибка: %s", e, exc_info=True)
+        return EXIT_UNKNOWN_ERROR
+
+    return main_with_args(args)
+
+
+def main_with_args(args: "argparse.Namespace") -> int:
+    """
+    Выполняет отправку по уже разобранным аргументам командной строки.
+
+    Args:
+        args (argparse.Namespace): Аргументы со всеми атрибутами, которые
+            дают parse_args и setup_arg_parser (отсутствующие атрибуты
+            не заменяются значениями по умолчанию)
+
+    Returns:
+        int: Код возврата (EXIT_SUCCESS при успешном выполнении)
 
+    Note:
+        Позволяет вызывать утилиту из другого кода без разбора командной
+        строки. Логирование настраивает вызывающий код (см. setup_logging)
+        Обрабатывает все исключения и возвращает соответствующие коды ошибок
+        Логирует все этапы выполнения и ошибки
+    """
+    try:
         logger.info("Запуск скрипта отправки email")
-        logger.debug(f"Аргументы командной строки: {args}")
+        logger.debug("Аргументы командной строки: %s", args)
 
         # Проверка конфликтующих аргументов
         if args.text and args.text_file:
@@ -617,64 +2452,90 @@ def main() -> int:
             )
             return EXIT_ARGUMENT_ERROR
 
+        if args.workers < 1:
+            logger.error("Ошибка: число соединений --workers должно быть не меньше 1")
+            return EXIT_ARGUMENT_ERROR
+
+        # "-" - чтение данных аутентификации из стандартного ввода
+        auth_from_stdin = args.auth_file and os.fspath(args.auth_file) == "-"
+        if args.auth_file and not auth_from_stdin:
+            if not validate_file_path(args.auth_file):
+                return EXIT_FILE_NOT_FOUND
+
         # Валидация email
         if args.sender and not validate_email(args.sender):
-            logger.error(f"Невалидный email отправителя: {args.sender}")
+            logger.error("Невалидный email отправителя: %s", args.sender)
             return EXIT_INVALID_EMAIL
 
-        if not validate_email(args.to):
-            logger.error(f"Невалидный email получателя: {args.to}")
-            return EXIT_INVALID_EMAIL
+        if args.batch:
+            # Пакетная отправка: получатели и вложения берутся из файла
+            if args.to:
+                logger.error("Ошибка: нельзя использовать одновременно --to и --batch")
+                return EXIT_ARGUMENT_ERROR
 
-        # Получение списка файлов
-        file_paths, error_code = parse_file_paths(
-            args.files if hasattr(args, "files") else "",
-            args.files_list if hasattr(args, "files_list") else None,
-        )
-        if error_code != EXIT_SUCCESS:
-            return error_code
+            jobs, error_code = parse_batch_file(args.batch)
+            if error_code != EXIT_SUCCESS:
+                return error_code
+            messages = build_batch_messages(args, jobs, get_email_text(args))
+        else:
+            recipients = [r.strip() for r in (args.to or "").split(",") if r.strip()]
+            if not recipients:
+                logger.error("Ошибка: не указан ни --to, ни --batch")
+                return EXIT_ARGUMENT_ERROR
+            for recipient in recipients:
+                if not validate_email(recipient):
+                    logger.error("Невалидный email получателя: %s", recipient)
+                    return EXIT_INVALID_EMAIL
+
+            # Получение списка файлов
+            file_paths, error_code = parse_file_paths(args.files, args.files_list)
+            if error_code != EXIT_SUCCESS:
+                return error_code
 
-        # Подготовка текста письма
-        try:
-            body = get_email_body(args, file_paths)
-            message = create_message(
-                args.sender or ADMIN_MAIL, args.to, args.subject, body
+            # Разбиение вложений на письма ограниченного размера
+            file_groups = split_attachments(file_paths, args.max_size * 1024 * 1024)
+            if len(file_groups) > 1:
+                logger.info("Вложения будут отправлены в %s письмах", len(file_groups))
+            messages = build_messages(
+                args, file_groups, recipients, get_email_text(args)
             )
-        except EmailSenderError as e:
-            logger.error(f"Ошибка подготовки письма: {str(e)}")
-            return EXIT_UNKNOWN_ERROR
 
-        # Добавление вложений
-        if not attach_files(message, file_paths):
-            logger.error("Ошибка при добавлении одного или нескольких вложений")
+        # Подготовка первого письма (остальные формируются по мере отправки)
+        try:
+            first_message = next(messages)
+        except FileReadError as e:
+            logger.error(str(e))
             return EXIT_ATTACHMENT_ERROR
+        except EmailSenderError as e:
+            logger.error("Ошибка подготовки письма: %s", e)
+            return EXIT_UNKNOWN_ERROR
 
-        # Отправка письма
+        # Отправка писем через одно соединение
         try:
-            error_code = send_email(
+            error_code = send_many(
                 args.server,
                 args.port,
-                args.sender or ADMIN_MAIL,
-                args.to,
-                message,
+                itertools.chain([first_message], messages),
                 args.ssl,
                 auth=args.auth,
                 auth_file=args.auth_file,
+                workers=args.workers,
+                verify=not args.insecure,
             )
             if error_code != EXIT_SUCCESS:
                 return error_code
         except AuthError as e:
-            logger.error(f"Ошибка аутентификации: {str(e)}")
+            logger.error("Ошибка аутентификации: %s", e)
             return EXIT_SMTP_AUTH_ERROR
         except Exception as e:
-            logger.error(f"Неизвестная ошибка при отправке: {str(e)}")
+            logger.error("Неизвестная ошибка при отправке: %s", e)
             return EXIT_UNKNOWN_ERROR
 
         logger.info("Скрипт успешно завершил работу")
         return EXIT_SUCCESS
 
     except Exception as e:
-        logger.critical(f"Критическая ошибка: {str(e)}", exc_info=True)
+        logger.critical("Критическая ошибка: %s", e, exc_info=True)
         return EXIT_UNKNOWN_ERROR
 
 
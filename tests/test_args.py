@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+Тесты разбора командной строки.
+
+Запуск: python -m unittest discover -s tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import send2mail  # noqa: E402
+
+# Командные строки, на которых быстрый разбор должен давать тот же
+# результат, что и argparse (или отказываться от разбора)
+ARGV_CASES = [
+    ["-s", "smtp.example.com", "-p", "25", "-t", "a@example.com", "-a", "f.txt"],
+    ["--server=smtp", "--port=587", "--to=a@b.cd,c@d.ef", "--files=x,y"],
+    ["-s", "smtp", "-p", "465", "-t", "a@b.cd", "--files-list", "list.txt", "-S"],
+    ["-s", "smtp", "-p", "465", "-t", "a@b.cd", "-a", "f", "-S", "--insecure"],
+    ["-s", "smtp", "-p", "25", "--batch", "batch.txt", "--workers", "4"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "-f"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "-f", "me@b.cd"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "-l"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "--log", "my.log"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "-j", "Тема", "-b", "x"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "-bf", "body.txt"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "-u", "user:pw"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "-uf", "auth.txt"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "--max-size", "0"],
+    ["-s", "smtp", "-p", " 25", "-t", "a@b.cd", "-a", "f"],
+    ["-s", "smtp", "-p", "1_0", "-t", "a@b.cd", "-a", "f"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "-uf", "-"],
+    ["-s", "smtp", "-p", "25", "-a", "f"],
+]
+
+# Командные строки, которые argparse отклоняет: быстрый разбор должен
+# передать их argparse, а не разбирать сам
+INVALID_ARGV_CASES = [
+    ["-s", "smtp", "-p", "²5", "-t", "a@b.cd", "-a", "f"],
+    ["-s", "smtp", "-p", "x", "-t", "a@b.cd", "-a", "f"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "--max-size", "1.5"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "--files-list", "l"],
+    ["-s", "smtp", "-t", "a@b.cd", "-a", "f"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "--unknown"],
+    ["-s", "smtp", "-p", "25", "-t", "a@b.cd", "-a", "f", "-S=1"],
+]
+
+
+class ParseArgsFastTest(unittest.TestCase):
+    """Сравнение parse_args_fast с argparse."""
+
+    def test_matches_argparse(self):
+        parser = send2mail.get_arg_parser()
+        for argv in ARGV_CASES:
+            with self.subTest(argv=argv):
+                expected = vars(parser.parse_args(argv))
+                fast = send2mail.parse_args_fast(argv)
+                if fast is not None:
+                    self.assertEqual(vars(fast), expected)
+
+    def test_invalid_input_is_left_to_argparse(self):
+        for argv in INVALID_ARGV_CASES:
+            with self.subTest(argv=argv):
+                self.assertIsNone(send2mail.parse_args_fast(argv))
+
+    def test_fast_path_is_used_for_typical_calls(self):
+        self.assertIsNotNone(send2mail.parse_args_fast(ARGV_CASES[0]))
+        self.assertIsNotNone(send2mail.parse_args_fast(ARGV_CASES[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+"""
+Тесты асинхронной отправки с подменой пакета aiosmtplib.
+
+Запуск: python -m unittest discover -s tests
+"""
+
+import asyncio
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import send2mail  # noqa: E402
+
+
+def make_aiosmtplib(send):
+    """Создает модуль-заменитель aiosmtplib с указанной функцией send."""
+    module = types.ModuleType("aiosmtplib")
+    module.SMTPException = type("SMTPException", (Exception,), {})
+    module.SMTPConnectError = type("SMTPConnectError", (module.SMTPException,), {})
+    module.SMTPAuthenticationError = type(
+        "SMTPAuthenticationError", (module.SMTPException,), {}
+    )
+    module.send = send
+    return module
+
+
+class SendManyAsyncTest(unittest.TestCase):
+    """Ограничение числа соединений в send_many_async."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def make_messages(self, count):
+        return [
+            send2mail.create_message(
+                "sender@example.com", "r%s@example.com" % i, "Тема", "Текст"
+            )
+            for i in range(count)
+        ]
+
+    def run_send(self, send, messages, **kwargs):
+        with mock.patch.dict(sys.modules, {"aiosmtplib": make_aiosmtplib(send)}):
+            with self.assertLogs("send2mail"):
+                return self.loop.run_until_complete(
+                    send2mail.send_many_async(
+                        "localhost", 25, messages, False, **kwargs
+                    )
+                )
+
+    def test_connections_are_limited(self):
+        active = 0
+        peak = 0
+        sent = []
+
+        async def send(message, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            sent.append(message["To"])
+            active -= 1
+
+        messages = self.make_messages(12)
+        code = self.run_send(send, iter(messages), max_connections=3)
+
+        self.assertEqual(code, send2mail.EXIT_SUCCESS)
+        self.assertEqual(peak, 3)
+        self.assertEqual(sorted(sent), sorted(m["To"] for m in messages))
+
+    def test_first_error_is_returned(self):
+        module = None
+
+        async def send(message, **kwargs):
+            if message["To"] == "r2@example.com":
+                raise module.SMTPConnectError("refused")
+            if message["To"] == "r4@example.com":
+                raise module.SMTPAuthenticationError("denied")
+
+        module = make_aiosmtplib(send)
+        with mock.patch.dict(sys.modules, {"aiosmtplib": module}):
+            with self.assertLogs("send2mail"):
+                code = self.loop.run_until_complete(
+                    send2mail.send_many_async(
+                        "localhost", 25, self.make_messages(6), False
+                    )
+                )
+        self.assertEqual(code, send2mail.EXIT_SMTP_CONNECTION_ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
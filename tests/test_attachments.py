@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""
+Тесты разбиения вложений на письма.
+
+Запуск: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import send2mail  # noqa: E402
+
+
+class SplitAttachmentsTest(unittest.TestCase):
+    """Проверка размера писем после split_attachments."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_file(self, name, size):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+        return Path(path)
+
+    def test_groups_fit_max_bytes_after_encoding(self):
+        max_bytes = 10 * 1024 * 1024
+        files = [self.make_file("f%s.bin" % i, 1500 * 1000) for i in range(6)]
+        files += [self.make_file("s%s.bin" % i, 300 * 1000) for i in range(5)]
+
+        groups = send2mail.split_attachments(files, max_bytes)
+        self.assertGreater(len(groups), 1)
+        self.assertEqual([p for group in groups for p in group], files)
+
+        for number, group in enumerate(groups, 1):
+            message = send2mail.create_message(
+                "sender@example.com",
+                "rcpt@example.com",
+                "Тема (%s/%s)" % (number, len(groups)),
+                send2mail.generate_default_email_body(group, None),
+            )
+            self.assertTrue(send2mail.attach_files(message, group, fail_fast=True))
+            wire = message.as_bytes(policy=message.policy.clone(linesep="\r\n"))
+            with self.subTest(group=number):
+                self.assertLess(len(wire), max_bytes)
+
+    def test_zero_disables_split(self):
+        files = [self.make_file("f%s.bin" % i, 1000) for i in range(3)]
+        self.assertEqual(send2mail.split_attachments(files, 0), [files])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""
+Тесты настройки логирования.
+
+Запуск: python -m unittest discover -s tests
+"""
+
+import atexit
+import io
+import logging
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import send2mail  # noqa: E402
+
+
+class SetupLoggingTest(unittest.TestCase):
+    """Повторные вызовы setup_logging."""
+
+    def tearDown(self):
+        send2mail.logger.removeHandler(send2mail._log_handler)
+        logging.getLogger().removeHandler(send2mail._log_handler)
+        if send2mail._log_listener is not None:
+            atexit.unregister(send2mail._log_listener.stop)
+            send2mail._log_listener.stop()
+        send2mail._log_handler = None
+        send2mail._log_listener = None
+
+    def test_repeated_setup_logs_once(self):
+        stream = io.StringIO()
+        with mock.patch("sys.stderr", stream):
+            send2mail.setup_logging()
+            send2mail.setup_logging()
+        send2mail.logger.info("hello")
+        send2mail._log_listener.stop()
+        atexit.unregister(send2mail._log_listener.stop)
+        send2mail._log_listener = None
+
+        self.assertEqual(len(send2mail.logger.handlers), 1)
+        self.assertEqual(stream.getvalue().count("hello"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+Тесты main_with_args без подключения к SMTP серверу.
+
+Запуск: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import send2mail  # noqa: E402
+
+
+class MainWithArgsTest(unittest.TestCase):
+    """Проверка аргументов и формирования писем."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_file(self, name, size):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        return path
+
+    def test_no_recipients_is_argument_error(self):
+        args = send2mail.get_arg_parser().parse_args(
+            ["-s", "localhost", "-p", "25", "-a", self.make_file("a.txt", 10)]
+        )
+        with self.assertLogs("send2mail", "ERROR"):
+            error_code = send2mail.main_with_args(args)
+        self.assertEqual(error_code, send2mail.EXIT_ARGUMENT_ERROR)
+
+    def test_batch_respects_max_size(self):
+        mib = 1024 * 1024
+        files = [self.make_file("big%s.bin" % i, 2 * mib) for i in range(3)]
+        batch = os.path.join(self.tmp.name, "batch.txt")
+        with open(batch, "w", encoding="utf-8") as f:
+            f.write("a@example.com,%s\n" % ",".join(files))
+            f.write("b@example.com,%s\n" % files[0])
+
+        args = send2mail.get_arg_parser().parse_args(
+            ["-s", "localhost", "-p", "25", "--batch", batch, "--max-size", "3"]
+        )
+        jobs, error_code = send2mail.parse_batch_file(args.batch)
+        self.assertEqual(error_code, send2mail.EXIT_SUCCESS)
+
+        messages = list(send2mail.build_batch_messages(args, jobs, None))
+        self.assertEqual(
+            [m["To"] for m in messages],
+            ["a@example.com"] * 3 + ["b@example.com"],
+        )
+        self.assertEqual(messages[0]["Subject"], "%s (1/3)" % args.subject)
+        self.assertEqual(messages[3]["Subject"], args.subject)
+
+    def test_text_file_is_read_once(self):
+        body = os.path.join(self.tmp.name, "body.txt")
+        with open(body, "w", encoding="utf-8") as f:
+            f.write("Текст из файла")
+        batch = os.path.join(self.tmp.name, "batch.txt")
+        with open(batch, "w", encoding="utf-8") as f:
+            for i in range(3):
+                f.write("r%s@example.com,%s\n" % (i, self.make_file("f%s" % i, 10)))
+
+        sent = []
+
+        def send_many(server, port, messages, *args, **kwargs):
+            sent.extend(messages)
+            return send2mail.EXIT_SUCCESS
+
+        args = send2mail.get_arg_parser().parse_args(
+            ["-s", "localhost", "-p", "25", "--batch", batch, "-bf", body]
+        )
+        read_text_file = mock.Mock(wraps=send2mail.read_text_file)
+        with mock.patch.object(send2mail, "read_text_file", read_text_file):
+            with mock.patch.object(send2mail, "send_many", send_many):
+                with self.assertLogs("send2mail"):
+                    error_code = send2mail.main_with_args(args)
+
+        self.assertEqual(error_code, send2mail.EXIT_SUCCESS)
+        self.assertEqual(read_text_file.call_count, 1)
+        self.assertEqual(len(sent), 3)
+        for message in sent:
+            text = message.get_payload(0).get_payload(decode=True).decode("utf-8")
+            self.assertTrue(text.startswith("Текст из файла"))
+
+
+if __name__ == "__main__":
+    unittest.main()
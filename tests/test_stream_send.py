@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""
+Тесты stream_send с локальным SMTP сервером на socketserver.
+
+Запуск: python -m unittest discover -s tests
+"""
+
+import email
+import os
+import smtplib
+import socketserver
+import sys
+import tempfile
+import threading
+import unittest
+from email import policy
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import send2mail  # noqa: E402
+
+# Текст письма со строками, начинающимися с точки (проверка экранирования)
+BODY = "Привет!\n.\n..две точки\n.точка в начале строки\nконец\n"
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Минимальный SMTP сервер: принимает письма и сохраняет их в server.messages."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self.reply("220 localhost ESMTP test")
+        envelope = {}
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                lines = ["localhost"] + self.server.extensions
+                for extension in lines[:-1]:
+                    self.reply("250-" + extension)
+                self.reply("250 " + lines[-1])
+            elif verb == "MAIL":
+                envelope = {"mail": command, "rcpt": []}
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                envelope["rcpt"].append(command.split(":", 1)[1].strip())
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                envelope["data"] = self.read_data()
+                self.server.messages.append(envelope)
+                if self.server.drop_after_data:
+                    return
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+    def read_data(self):
+        """Читает DATA до строки "." и снимает экранирование точек."""
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if line == b".\r\n":
+                return b"".join(lines)
+            if line.startswith(b"."):
+                line = line[1:]
+            lines.append(line)
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, extensions):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.extensions = extensions
+        self.messages = []
+        # Закрывать соединение после приема письма, не отвечая на DATA
+        self.drop_after_data = False
+
+
+class StreamSendTest(unittest.TestCase):
+    """Отправка через stream_send при разных расширениях сервера."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        # Мелкие вложения попадают во временный файл: в сумме больше
+        # _SPOOL_MAX_SIZE, чтобы файл был сброшен на диск
+        small_size = send2mail._STREAM_MIN_SIZE - 4096
+        count = send2mail._SPOOL_MAX_SIZE // small_size + 2
+        cls.files = [
+            cls.make_file("small%02d.bin" % i, small_size) for i in range(count)
+        ]
+        # Большое вложение передается из файла (FileAttachment)
+        cls.files.append(
+            cls.make_file("big.bin", send2mail._STREAM_MIN_SIZE * 2 + 12345)
+        )
+        cls.files.append(cls.make_file("dots.txt", 0, b".\r\n..\r\n.a\n.\n"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    @classmethod
+    def make_file(cls, name, size, data=None):
+        if data is None:
+            data = os.urandom(size)
+        path = os.path.join(cls.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return Path(path)
+
+    def start_server(self, extensions):
+        server = SMTPServer(extensions)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def send(self, extensions, message=None):
+        server = self.start_server(extensions)
+
+        if message is None:
+            message = self.make_message(self.files)
+
+        host, port = server.server_address
+        smtp = smtplib.SMTP(host, port, timeout=30)
+        try:
+            send2mail.stream_send(smtp, message)
+        finally:
+            smtp.quit()
+
+        self.assertEqual(len(server.messages), 1)
+        return server.messages[0]
+
+    def make_message(self, files):
+        message = send2mail.create_message(
+            "sender@example.com", "rcpt@example.com", "Тест", BODY
+        )
+        self.assertTrue(send2mail.attach_files(message, files, fail_fast=True))
+        return message
+
+    def check_message(self, envelope, eight_bit, files=None):
+        files = self.files if files is None else files
+        self.assertEqual(envelope["mail"].endswith("BODY=8BITMIME"), eight_bit)
+        self.assertEqual(envelope["rcpt"], ["<rcpt@example.com>"])
+
+        received = email.message_from_bytes(envelope["data"], policy=policy.default)
+        parts = list(received.iter_attachments())
+        self.assertEqual(
+            [part.get_filename() for part in parts], [p.name for p in files]
+        )
+        for part, path in zip(parts, files):
+            with self.subTest(file=path.name):
+                self.assertEqual(part.get_content(), path.read_bytes())
+
+        text = received.get_body(("plain",))
+        expected_cte = "8bit" if eight_bit else "base64"
+        self.assertEqual(text["Content-Transfer-Encoding"], expected_cte)
+        self.assertEqual(text.get_content().replace("\r\n", "\n"), BODY)
+
+    def test_extensions(self):
+        self.assertGreater(
+            sum(p.stat().st_size for p in self.files[:-2]) * 4 // 3,
+            send2mail._SPOOL_MAX_SIZE,
+        )
+        for pipelining in (False, True):
+            for eight_bit in (False, True):
+                extensions = []
+                if pipelining:
+                    extensions.append("PIPELINING")
+                if eight_bit:
+                    extensions.append("8BITMIME")
+                with self.subTest(extensions=extensions):
+                    self.check_message(self.send(extensions), eight_bit)
+
+    def test_as_bytes_keeps_base64_text(self):
+        files = self.files[-1:]
+        message = self.make_message(files)
+        self.check_message(self.send(["8BITMIME"], message), True, files)
+
+        # Текст передан в 8bit, но само письмо не изменилось
+        text = email.message_from_bytes(message.as_bytes()).get_payload(0)
+        self.assertEqual(text["Content-Transfer-Encoding"], "base64")
+
+    def test_no_resend_after_data(self):
+        server = self.start_server([])
+        server.drop_after_data = True
+        message = self.make_message(self.files[-1:])
+
+        host, port = server.server_address
+        pool = send2mail.SMTPPool(host, port, False, max_connections=2)
+        try:
+            with self.assertLogs("send2mail"):
+                with self.assertRaises(send2mail.DeliveryUnknownError):
+                    send2mail.send_parallel(pool, [message], 2)
+        finally:
+            pool.close()
+
+        # Письмо передано один раз: повторной отправки не было
+        self.assertEqual(len(server.messages), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()